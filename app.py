@@ -2,23 +2,35 @@ import sys
 import threading
 import traceback
 
-from scripts.sync_nas_to_notion import sync_nas_to_notion
+from scripts.sync_nas_to_notion import (
+    NAS_ROOT_LOCAL,
+    sync_nas_to_notion,
+    log_nas_event,
+)
+from services.nas_watcher import NasWatcher
 from ui.main_window import MovieUpdaterWindow
 
 
 def run_nas_sync():
     """
     Lance la synchronisation NAS → Notion
-    dans un thread séparé pour ne pas bloquer l'UI
+    dans un thread séparé pour ne pas bloquer l'UI,
+    puis surveille le NAS (fichiers ajoutés / retirés / déplacés)
     """
     print("🔄 Sync NAS → Notion au démarrage de l'application")
+    watcher = NasWatcher(NAS_ROOT_LOCAL)
+
     try:
-        sync_nas_to_notion()
+        sync_nas_to_notion(index=watcher.index)
         print("✅ Sync NAS terminée")
     except Exception:
         print("⚠️ Erreur lors de la sync NAS")
         traceback.print_exc()
 
+    watcher.subscribe(log_nas_event)
+    watcher.start()
+    print("👀 Surveillance du NAS active")
+
 
 if __name__ == "__main__":
     auto = "--auto" in sys.argv
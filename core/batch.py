@@ -0,0 +1,104 @@
+from core.calendar import sync_future_releases
+from core.enrichment import EnrichmentPipeline
+from core.notion import (
+    iter_pages,
+    tmdb_pending_filter,
+    get_future_releases,
+    get_title,
+    get_release_date,
+    block_cache,
+)
+from core.prefetch import LookAhead
+from core.review_queue import ReviewQueue
+from core.tmdb import find_candidates, reset_details_memo
+
+
+def _print_log(msg, level="info"):
+    print(msg)
+
+
+def run_batch_enrichment(
+    *,
+    log=_print_log,
+    window: int = 8,
+    workers: int = 4,
+    requeue: bool = False,
+    calendar: bool = True,
+    queue: ReviewQueue | None = None
+) -> dict:
+    """
+    Enrichissement sans interface :
+    - auto-pick validé → appliqué directement
+    - cas ambigus → file de revue (candidats classés), sans bloquer
+    requeue=True : les films déjà en file sont recherchés à nouveau.
+    Retour : {"applied", "queued", "errors"}
+    """
+    queue = queue if queue is not None else ReviewQueue()
+    stats = {"applied": 0, "queued": 0, "errors": 0}
+
+    block_cache.clear()
+    reset_details_memo()
+
+    def report(results):
+        for label, error in results:
+            if error:
+                stats["errors"] += 1
+                log(f"❌ {label} : {error}", "error")
+            else:
+                stats["applied"] += 1
+                log(f"✅ {label} enrichi", "success")
+
+    # Instantané de la file (relue sur disque à chaque accès)
+    queued = set() if requeue else {item["page_id"] for item in queue.items()}
+
+    films = (
+        film for film in iter_pages(filter=tmdb_pending_filter(), prefetch=True)
+        if get_title(film) and film.id not in queued
+    )
+
+    pipeline = EnrichmentPipeline(workers=workers)
+    lookahead = LookAhead(
+        films,
+        lambda film: find_candidates(get_title(film)),
+        window=window
+    )
+
+    try:
+        for film, prepared in lookahead:
+            report(pipeline.drain())
+            title = get_title(film)
+
+            try:
+                decision = prepared.result()
+            except Exception as e:
+                stats["errors"] += 1
+                log(f"❌ {title} : recherche TMDB impossible ({e})", "error")
+                continue
+
+            if decision["pick"]:
+                queue.discard(film.id)
+                pipeline.submit(film, decision["pick"], label=title)
+                continue
+
+            reason = "ambigu" if decision["results"] else "aucun résultat"
+            queue.add(film, decision, reason=reason)
+            stats["queued"] += 1
+            log(f"📋 {title} → file de revue ({reason})", "info")
+
+        report(pipeline.join())
+
+    except BaseException:
+        lookahead.cancel()
+        pipeline.shutdown()
+        raise
+
+    if calendar:
+        log("📅 Synchronisation calendrier…", "info")
+        sync_future_releases(
+            get_future_releases(),
+            get_title,
+            get_release_date,
+            log=log
+        )
+
+    return stats
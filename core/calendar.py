@@ -1,72 +1,403 @@
+import json
+import os
 from datetime import datetime, timedelta
 from config import calendar_service, CALENDAR_ID
+from utils.paths import cache_path
+from utils.rate_limit import governor
+from utils.text import normalize_title
+
+
+# Maximum d'opérations par requête batch Google
+BATCH_SIZE = 50
+
+
+def _execute(request, cost: int = 1):
+    """Exécute une requête Google via le gouverneur (quota, 429, 5xx)"""
+    return governor("calendar").call(request.execute, cost=cost)
 
 
 def _event_uid(page_id: str) -> str:
     return f"notion-film-{page_id}"
 
 
-def _event_exists_by_uid(uid: str) -> bool:
-    events = calendar_service.events().list(
-        calendarId=CALENDAR_ID,
-        privateExtendedProperty=f"notion_uid={uid}"
-    ).execute().get("items", [])
-    return bool(events)
+def _event_day(event: dict) -> str:
+    start = event.get("start", {})
+    return (start.get("date") or start.get("dateTime") or "")[:10]
 
 
-def _event_exists_by_title_and_day(title: str, day: datetime) -> bool:
-    start = day.strftime("%Y-%m-%dT00:00:00Z")
-    end = day.strftime("%Y-%m-%dT23:59:59Z")
+def _reminder_event(title: str, release_date: datetime, page_id: str) -> dict:
+    reminder_day = (release_date - timedelta(days=1)).strftime("%Y-%m-%d")
+    return {
+        "summary": f"🎬 Sortie demain : {title}",
+        "start": {"date": reminder_day},
+        "end": {"date": reminder_day},
+        "extendedProperties": {
+            "private": {"notion_uid": _event_uid(page_id)}
+        }
+    }
 
-    events = calendar_service.events().list(
+
+def _insert_request(event: dict):
+    return calendar_service.events().insert(
         calendarId=CALENDAR_ID,
-        timeMin=start,
-        timeMax=end,
-        q=title
-    ).execute().get("items", [])
-    return bool(events)
+        body=event
+    )
+
+
+def _status(exc) -> int | None:
+    return getattr(getattr(exc, "resp", None), "status", None)
+
+
+def _run_batched(ops: list[tuple[str, object]], log=None) -> list:
+    """
+    ops : [(libellé, fabrique de requête)] envoyés par requêtes batch
+    (BATCH_SIZE opérations par appel HTTP).
+    Les opérations en échec sont retentées une par une.
+    Retour : [(libellé, réponse, erreur)] dans l'ordre de `ops`.
+    """
+    results = [None] * len(ops)
+    failed = []
+
+    for start in range(0, len(ops), BATCH_SIZE):
+        chunk = range(start, min(start + BATCH_SIZE, len(ops)))
+        responses = {}
+
+        def callback(request_id, response, exception):
+            responses[request_id] = (response, exception)
+
+        batch = calendar_service.new_batch_http_request(callback=callback)
+        for i in chunk:
+            batch.add(ops[i][1](), request_id=str(i))
+
+        try:
+            _execute(batch, cost=len(chunk))
+        except Exception as e:
+            if log:
+                log(f"⚠️ Batch calendrier en échec : {e}", "warn")
+            failed.extend(chunk)
+            continue
+
+        for i in chunk:
+            response, exception = responses.get(str(i), (None, "sans réponse"))
 
+            if exception:
+                if log:
+                    log(f"⚠️ {ops[i][0]} : échec (nouvel essai)", "warn")
+                failed.append(i)
+            else:
+                results[i] = (ops[i][0], response, None)
 
-def create_release_reminder(
+    for i in failed:
+        label, make_request = ops[i]
+        try:
+            results[i] = (label, _execute(make_request()), None)
+        except Exception as e:
+            results[i] = (label, None, e)
+
+    return results
+
+
+def insert_reminders(
+    pending: list[tuple[str, dict]],
     *,
-    title: str,
-    release_date: datetime,
-    page_id: str,
     log=None
-):
-    uid = _event_uid(page_id)
-    reminder_day = release_date - timedelta(days=1)
+) -> list[tuple[dict, dict]]:
+    """
+    pending : [(titre, événement)] insérés par lots.
+    Retour : [(événement, événement créé)] pour les insertions réussies.
+    """
+    results = _run_batched(
+        [
+            (title, lambda event=event: _insert_request(event))
+            for title, event in pending
+        ],
+        log=log
+    )
 
-    if _event_exists_by_uid(uid):
-        if log:
-            log(f"📅 Rappel déjà existant (UID) : {title}", "info")
-        return
+    created = []
+    for (title, event), (_, response, error) in zip(pending, results):
+        if error:
+            if log:
+                log(f"❌ Rappel impossible : {title} ({error})", "error")
+            continue
 
-    if _event_exists_by_title_and_day(title, reminder_day):
+        response = response or event
+        created.append((event, response))
         if log:
-            log(f"📅 Rappel déjà existant (ancien event) : {title}", "info")
-        return
+            log(f"📅 Rappel créé : {title}", "success")
 
-    event = {
-        "summary": f"🎬 Sortie demain : {title}",
-        "start": {"date": reminder_day.strftime("%Y-%m-%d")},
-        "end": {"date": reminder_day.strftime("%Y-%m-%d")},
-        "extendedProperties": {
-            "private": {"notion_uid": uid}
-        }
-    }
+    return created
 
-    calendar_service.events().insert(
-        calendarId=CALENDAR_ID,
-        body=event
-    ).execute()
 
-    if log:
-        log(f"📅 Rappel créé : {title}", "success")
+# =========================
+# Synchronisation incrémentale
+# =========================
+
+def _page_id_of(event: dict) -> str | None:
+    uid = (
+        event.get("extendedProperties", {})
+        .get("private", {})
+        .get("notion_uid")
+        or ""
+    )
+    prefix = _event_uid("")
+    return uid[len(prefix):] if uid.startswith(prefix) else None
+
+
+class CalendarSync:
+    """
+    État local de la synchro Notion → Google Calendar (fichier JSON,
+    lié à CALENDAR_ID) :
+    - sync_token : nextSyncToken du dernier listing
+    - reminders : {page_id: {"event_id", "date", "summary"}}
+    - legacy : {event_id: {"date", "title"}} anciens rappels sans UID
+    Chaque run ne liste que les changements du calendrier (syncToken),
+    puis n'émet que les insert / patch / delete nécessaires.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or cache_path("calendar_sync.json")
+        self.sync_token = None
+        self.reminders = {}
+        self.legacy = {}
+
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+            # État d'un autre calendrier : jeton et ids d'événements inutilisables
+            if state.get("calendar_id") == CALENDAR_ID:
+                self.sync_token = state.get("sync_token")
+                self.reminders = state.get("reminders", {})
+                self.legacy = state.get("legacy", {})
+
+    def _save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "calendar_id": CALENDAR_ID,
+                    "sync_token": self.sync_token,
+                    "reminders": self.reminders,
+                    "legacy": self.legacy,
+                },
+                f,
+                ensure_ascii=False,
+                indent=1
+            )
+        os.replace(tmp_path, self.path)
+
+    # =========================
+    # Google → état local
+    # =========================
+
+    def _list(self, sync_token: str | None):
+        """
+        Listing paginé ; syncToken est incompatible avec timeMin
+        et privateExtendedProperty, le listing complet n'en a donc pas.
+        """
+        events = []
+        page_token = None
+
+        while True:
+            params = {"calendarId": CALENDAR_ID, "maxResults": 2500}
+            if sync_token:
+                params["syncToken"] = sync_token
+            if page_token:
+                params["pageToken"] = page_token
+
+            response = _execute(calendar_service.events().list(**params))
+            events.extend(response.get("items", []))
+
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return events, response.get("nextSyncToken")
+
+    def _record(self, event: dict):
+        event_id = event.get("id")
+        if not event_id:
+            return
+
+        if event.get("status") == "cancelled":
+            self.legacy.pop(event_id, None)
+            for page_id, entry in list(self.reminders.items()):
+                if entry["event_id"] == event_id:
+                    del self.reminders[page_id]
+            return
+
+        day = _event_day(event)
+        page_id = _page_id_of(event)
+
+        if page_id:
+            self.reminders[page_id] = {
+                "event_id": event_id,
+                "date": day,
+                "summary": event.get("summary", ""),
+            }
+        elif event.get("summary"):
+            self.legacy[event_id] = {
+                "date": day,
+                "title": normalize_title(event["summary"]),
+            }
+
+    def pull(self, log=None):
+        """Applique les changements du calendrier depuis le dernier sync"""
+        full = not self.sync_token
+
+        try:
+            events, token = self._list(self.sync_token)
+        except Exception as e:
+            if full or _status(e) != 410:
+                raise
+            # 410 Gone : jeton expiré → listing complet
+            if log:
+                log("📅 Jeton de synchro calendrier expiré, relisting complet", "info")
+            full = True
+            events, token = self._list(None)
+
+        if full:
+            self.reminders = {}
+            self.legacy = {}
+
+        for event in events:
+            self._record(event)
+
+        self.sync_token = token
+        self._save()
+
+    # =========================
+    # Notion → Google
+    # =========================
+
+    def _has_legacy(self, title: str, day: str) -> bool:
+        norm = normalize_title(title)
+        return bool(norm) and any(
+            entry["date"] == day and norm in entry["title"]
+            for entry in self.legacy.values()
+        )
+
+    def _patch_request(self, event_id: str, body: dict):
+        return calendar_service.events().patch(
+            calendarId=CALENDAR_ID,
+            eventId=event_id,
+            body=body
+        )
+
+    def _delete_request(self, event_id: str):
+        return calendar_service.events().delete(
+            calendarId=CALENDAR_ID,
+            eventId=event_id
+        )
+
+    def run(self, releases: dict[str, tuple[str, datetime]], log=None) -> dict:
+        """
+        releases : {page_id: (titre, date de sortie)}, l'ensemble complet
+        des sorties futures (les rappels futurs absents sont supprimés).
+        Retour : {"inserted", "patched", "deleted"}
+        """
+        self.pull(log=log)
+
+        today = datetime.now().strftime("%Y-%m-%d")
+        inserts, patches, deletes = [], [], []
+        stats = {"inserted": 0, "patched": 0, "deleted": 0}
+
+        for page_id, (title, release) in releases.items():
+            event = _reminder_event(title, release, page_id)
+            day = event["start"]["date"]
+            known = self.reminders.get(page_id)
+
+            if day < today:
+                # Sortie aujourd'hui : trop tard pour un rappel la veille
+                continue
+
+            if known is None:
+                if self._has_legacy(title, day):
+                    if log:
+                        log(f"📅 Rappel déjà existant (ancien event) : {title}", "info")
+                    continue
+                inserts.append((page_id, title, event))
+
+            elif known["date"] != day or known["summary"] != event["summary"]:
+                body = {
+                    key: event[key] for key in ("summary", "start", "end")
+                }
+                patches.append((page_id, title, known["event_id"], body))
+
+        for page_id, entry in self.reminders.items():
+            if page_id not in releases and entry["date"] >= today:
+                deletes.append((page_id, entry["event_id"]))
+
+        # Insertions
+        created = insert_reminders(
+            [(title, event) for _, title, event in inserts],
+            log=log
+        )
+        for _, response in created:
+            self._record(response)
+        stats["inserted"] = len(created)
+
+        # Dates / titres modifiés
+        results = _run_batched(
+            [
+                (
+                    f"Rappel {title}",
+                    lambda e=event_id, b=body: self._patch_request(e, b)
+                )
+                for _, title, event_id, body in patches
+            ],
+            log=log
+        )
+        for (page_id, title, _, body), (_, response, error) in zip(patches, results):
+            if error:
+                if _status(error) in (404, 410):
+                    # Supprimé côté Google : recréé au prochain run
+                    self.reminders.pop(page_id, None)
+                if log:
+                    log(f"❌ Rappel non déplacé : {title} ({error})", "error")
+                continue
+            self._record(response)
+            stats["patched"] += 1
+            if log:
+                log(f"📅 Rappel déplacé : {title} → {body['start']['date']}", "success")
+
+        # Sorties retirées ou passées dans le passé
+        results = _run_batched(
+            [
+                (f"Rappel {page_id}", lambda e=event_id: self._delete_request(e))
+                for page_id, event_id in deletes
+            ],
+            log=log
+        )
+        for (page_id, _), (_, _, error) in zip(deletes, results):
+            if error and _status(error) not in (404, 410):
+                if log:
+                    log(f"❌ Rappel non supprimé : {page_id} ({error})", "error")
+                continue
+            self.reminders.pop(page_id, None)
+            stats["deleted"] += 1
+            if log:
+                log(f"🗑️ Rappel supprimé : {page_id}", "info")
+
+        # Rappels passés : plus rien à synchroniser
+        for page_id, entry in list(self.reminders.items()):
+            if entry["date"] < today:
+                del self.reminders[page_id]
+        for event_id, entry in list(self.legacy.items()):
+            if entry["date"] < today:
+                del self.legacy[event_id]
+
+        self._save()
+        return stats
 
 
 def sync_future_releases(pages, get_title, get_release_date, log=None):
+    """
+    pages : FilmRecord des sorties futures (core.notion.get_future_releases),
+    ensemble complet ; le test sur la date reste un simple garde-fou.
+    Synchro incrémentale (CalendarSync) : un run sans changement ne coûte
+    qu'un listing syncToken côté Google.
+    """
     now = datetime.now()
+    releases = {}
 
     for page in pages:
         title = get_title(page)
@@ -75,12 +406,13 @@ def sync_future_releases(pages, get_title, get_release_date, log=None):
         if not title or not release or release <= now:
             continue
 
-        if log:
-            log(f"📅 Sync calendrier : {title}", "info")
+        releases[page.id] = (title, release)
 
-        create_release_reminder(
-            title=title,
-            release_date=release,
-            page_id=page["id"],
-            log=log
+    stats = CalendarSync().run(releases, log=log)
+
+    if log:
+        log(
+            f"📅 Calendrier : {stats['inserted']} créés · "
+            f"{stats['patched']} déplacés · {stats['deleted']} supprimés",
+            "info"
         )
@@ -0,0 +1,147 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from core.film import FilmRecord
+from core.notion import (
+    build_movie_properties,
+    apply_film_enrichment,
+    compute_tags_from_categories,
+)
+from core.tmdb import (
+    get_movie_details,
+    director_from_details,
+    genres_from_details,
+    movie_genres,
+    get_movie_poster_url,
+    get_movie_backdrop_url,
+)
+
+
+# =========================
+# Enrichissement d'une page
+# =========================
+
+def parse_release_date(movie: dict) -> datetime | None:
+    if movie.get("release_date"):
+        try:
+            return datetime.strptime(movie["release_date"], "%Y-%m-%d")
+        except ValueError:
+            pass
+    return None
+
+
+def enrich_page(film: FilmRecord, movie: dict) -> dict:
+    """
+    Film TMDB choisi → page Notion :
+    genres + réalisateur + images (1 requête TMDB),
+    propriétés, cover et poster (Notion)
+    Retour : statistiques d'appels Notion (voir apply_film_enrichment)
+    """
+    release = parse_release_date(movie)
+
+    # Chemins d'images du film choisi, complétés par les détails
+    details = get_movie_details(movie["id"]) or {}
+    images = {**details, **{k: v for k, v in movie.items() if v}}
+
+    # Genres depuis genre_ids (carte locale) ou le film déjà chargé
+    genres = movie_genres(movie) or genres_from_details(details)
+    tags = compute_tags_from_categories(
+        genres,
+        release.year if release else None
+    )
+
+    properties = build_movie_properties(
+        title=movie["title"],
+        synopsis=movie.get("overview", ""),
+        genres=genres,
+        tags=tags,
+        director=director_from_details(details),
+        release_date=release,
+        support="Cinéma"
+        if release and release > datetime.now()
+        else "À télécharger"
+    )
+
+    # Cover = backdrop si dispo, sinon poster
+    poster_url = get_movie_poster_url(images)
+    cover_url = get_movie_backdrop_url(images) or poster_url
+
+    return apply_film_enrichment(
+        film,
+        properties=properties,
+        cover_url=cover_url,
+        poster_url=poster_url
+    )
+
+
+# =========================
+# Pipeline concurrent
+# =========================
+
+class EnrichmentPipeline:
+    """
+    Pool borné de workers pour la phase d'écriture :
+    la boucle principale soumet un film et passe au suivant.
+    Les résultats (label, erreur | None) sont récupérés
+    par le thread appelant via drain() / join().
+    """
+
+    def __init__(self, workers: int = 4):
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="enrich"
+        )
+        self._results = queue.Queue()
+        self._futures = []
+        self._lock = threading.Lock()
+        self.saved_calls = 0
+
+    def _run(self, film: FilmRecord, movie: dict, label: str):
+        try:
+            stats = enrich_page(film, movie)
+        except Exception as e:
+            self._results.put((label, str(e) or type(e).__name__))
+        else:
+            with self._lock:
+                self.saved_calls += stats["saved"]
+            self._results.put((label, None))
+
+    def submit(self, film: FilmRecord, movie: dict, *, label: str):
+        self._futures.append(
+            self._executor.submit(self._run, film, movie, label)
+        )
+
+    def drain(self) -> list[tuple[str, str | None]]:
+        """Résultats terminés depuis le dernier appel (non bloquant)"""
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def pending(self) -> int:
+        """Nombre d'enrichissements pas encore terminés"""
+        return sum(1 for future in self._futures if not future.done())
+
+    def wait(self, timeout: float) -> list[tuple[str, str | None]]:
+        """Comme drain(), mais attend au plus `timeout` s un premier résultat"""
+        try:
+            first = self._results.get(timeout=timeout)
+        except queue.Empty:
+            return []
+        return [first] + self.drain()
+
+    def join(self) -> list[tuple[str, str | None]]:
+        """Attend la fin de tous les enrichissements soumis"""
+        self._executor.shutdown(wait=True)
+        self._futures.clear()
+        return self.drain()
+
+    def shutdown(self):
+        """Abandon : les films non démarrés sont annulés"""
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+def _plain_text(prop: dict | None) -> str | None:
+    if not prop:
+        return None
+    parts = prop.get("title") or prop.get("rich_text") or []
+    text = "".join(
+        p.get("plain_text") or p.get("text", {}).get("content", "")
+        for p in parts
+    )
+    return text or None
+
+
+def _names(prop: dict | None) -> tuple[str, ...]:
+    if not prop:
+        return ()
+    return tuple(o["name"] for o in prop.get("multi_select") or [])
+
+
+def _date(prop: dict | None) -> datetime | None:
+    date_prop = (prop or {}).get("date")
+    if date_prop and date_prop.get("start"):
+        return datetime.strptime(date_prop["start"][:10], "%Y-%m-%d")
+    return None
+
+
+def _cover_url(page: dict) -> str | None:
+    cover = page.get("cover") or {}
+    return cover.get(cover.get("type", "external"), {}).get("url")
+
+
+@dataclass(slots=True)
+class FilmRecord:
+    """
+    Film Notion réduit aux champs utiles, construit une fois à la lecture.
+    Le JSON brut de la page n'est conservé que sur demande (keep_raw).
+    """
+
+    id: str
+    title: str | None = None
+    release_date: datetime | None = None
+    tmdb_ok: bool = False
+    categories: tuple[str, ...] = ()
+    tags: tuple[str, ...] = ()
+    nas_path: str | None = None
+    cover: str | None = None
+    last_edited: str = ""
+    raw: dict | None = None
+
+    @classmethod
+    def from_page(cls, page: dict, *, keep_raw: bool = False) -> "FilmRecord":
+        props = page.get("properties", {})
+
+        return cls(
+            id=page["id"],
+            title=_plain_text(props.get("Nom")),
+            release_date=_date(props.get("Date de sortie")),
+            tmdb_ok=bool(props.get("TMDB_OK", {}).get("checkbox", False)),
+            categories=_names(props.get("Catégorie")),
+            tags=_names(props.get("Tags")),
+            nas_path=_plain_text(props.get("NAS Path")),
+            cover=_cover_url(page),
+            last_edited=page.get("last_edited_time", ""),
+            raw=page if keep_raw else None,
+        )
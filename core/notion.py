@@ -1,77 +1,138 @@
 from datetime import datetime
-import time
 from config import notion, DATABASE_ID
+from core.film import FilmRecord
+from core.notion_mirror import NotionMirror
+from core.notion_paging import iter_database, MAX_PAGE_SIZE
+from core.notion_blocks import BlockCache
+from utils.bulk import run_bulk_job
+from utils.paths import cache_path
+from utils.rate_limit import governor
+
+# Tous les appels Notion passent par le gouverneur (≈ 3 req/s)
+_call = governor("notion").call
+
+# Enfants des pages, lus une fois par run (vider via block_cache.clear())
+block_cache = BlockCache(notion)
+
+_mirror = NotionMirror(notion, DATABASE_ID)
 
 
 # =========================
 # Récupération des pages
 # =========================
 
-def fetch_all_pages():
-    pages = []
-    cursor = None
+def fetch_all_pages(*, full: bool = False, keep_raw: bool = False):
+    """
+    Tous les films de la base (FilmRecord), via le miroir local :
+    seules les pages modifiées depuis le dernier lancement sont téléchargées.
+    full=True : scan complet, pages supprimées / archivées retirées
+    (à utiliser avant d'écrire dans les pages).
+    """
+    return _mirror.pages(full=full, keep_raw=keep_raw)
 
-    while True:
-        response = notion.databases.query(
-            database_id=DATABASE_ID,
-            start_cursor=cursor
-        )
 
-        pages.extend(response.get("results", []))
+def iter_pages(
+    filter: dict | None = None,
+    page_size: int = MAX_PAGE_SIZE,
+    prefetch: bool = False,
+    keep_raw: bool = False
+):
+    """
+    Films de la base (FilmRecord) au fil de l'eau (lot par lot).
+    prefetch=True : le lot suivant est lu en arrière-plan.
+    keep_raw=True : le JSON Notion reste accessible via record.raw
+    """
+    pages = iter_database(
+        notion,
+        DATABASE_ID,
+        query_filter=filter,
+        page_size=page_size,
+        prefetch=prefetch
+    )
+    return (FilmRecord.from_page(page, keep_raw=keep_raw) for page in pages)
 
-        if not response.get("has_more"):
-            break
 
-        cursor = response.get("next_cursor")
+def query_pages(query_filter: dict) -> list[FilmRecord]:
+    """Films correspondant à un filtre Notion (filtrage côté serveur)"""
+    return list(iter_pages(filter=query_filter))
 
-    return pages
+
+# =========================
+# Filtres Notion
+# =========================
+
+def tmdb_pending_filter() -> dict:
+    """TMDB_OK décoché"""
+    return {"property": "TMDB_OK", "checkbox": {"equals": False}}
+
+
+def untagged_filter() -> dict:
+    """Enrichi TMDB, Catégorie renseignée, Tags vides"""
+    return {
+        "and": [
+            {"property": "TMDB_OK", "checkbox": {"equals": True}},
+            {"property": "Catégorie", "multi_select": {"is_not_empty": True}},
+            {"property": "Tags", "multi_select": {"is_empty": True}},
+        ]
+    }
+
+
+def future_releases_filter(today: datetime | None = None) -> dict:
+    """Date de sortie strictement après aujourd'hui"""
+    today = today or datetime.now()
+    return {
+        "property": "Date de sortie",
+        "date": {"after": today.strftime("%Y-%m-%d")}
+    }
 
 
 # =========================
 # Sélecteurs métier
 # =========================
 
-def get_title(page):
-    title_prop = page["properties"].get("Nom", {}).get("title")
-    if title_prop:
-        return title_prop[0]["text"]["content"]
-    return None
+def get_title(film: FilmRecord):
+    return film.title
 
 
-def is_tmdb_done(page) -> bool:
-    return page["properties"].get("TMDB_OK", {}).get("checkbox", False)
+def is_tmdb_done(film: FilmRecord) -> bool:
+    return film.tmdb_ok
 
 
-def get_release_date(page):
-    date_prop = page["properties"].get("Date de sortie", {}).get("date")
-    if date_prop and date_prop.get("start"):
-        return datetime.strptime(date_prop["start"][:10], "%Y-%m-%d")
-    return None
+def get_release_date(film: FilmRecord):
+    return film.release_date
 
 
-def get_movies_to_enrich(pages):
-    """Films sans enrichissement TMDB"""
+def get_movies_to_enrich(pages=None):
+    """
+    Films sans enrichissement TMDB.
+    Sans `pages` : requête filtrée côté Notion.
+    """
+    if pages is None:
+        return query_pages(tmdb_pending_filter())
+
     return [
         page for page in pages
         if not is_tmdb_done(page)
     ]
 
 
-def get_movies_without_tags(pages):
-    """Films enrichis TMDB mais sans tags (resync one-shot)"""
-    movies = []
-
-    for page in pages:
-        if not is_tmdb_done(page):
-            continue
+def get_movies_without_tags(pages=None):
+    """
+    Films enrichis TMDB mais sans tags (resync one-shot).
+    Sans `pages` : requête filtrée côté Notion.
+    """
+    if pages is None:
+        return query_pages(untagged_filter())
 
-        categories = page["properties"].get("Catégorie", {}).get("multi_select", [])
-        tags = page["properties"].get("Tags", {}).get("multi_select", [])
+    return [
+        film for film in pages
+        if is_tmdb_done(film) and film.categories and not film.tags
+    ]
 
-        if categories and not tags:
-            movies.append(page)
 
-    return movies
+def get_future_releases():
+    """Films dont la date de sortie est après aujourd'hui (itérateur)"""
+    return iter_pages(filter=future_releases_filter(), prefetch=True)
 
 
 # =========================
@@ -119,17 +180,7 @@ def compute_tags_from_categories(
 # =========================
 
 def page_has_image_url(page_id: str, image_url: str) -> bool:
-    blocks = notion.blocks.children.list(
-        block_id=page_id
-    ).get("results", [])
-
-    for block in blocks:
-        if block.get("type") == "image":
-            ext = block["image"].get("external", {})
-            if ext.get("url") == image_url:
-                return True
-
-    return False
+    return block_cache.has_image(page_id, image_url)
 
 
 def add_image_block(
@@ -147,62 +198,7 @@ def add_image_block(
         }
     }
 
-    if after_block_id:
-        notion.blocks.children.append(
-            block_id=page_id,
-            after=after_block_id,
-            children=[image_block]
-        )
-    else:
-        notion.blocks.children.append(
-            block_id=page_id,
-            children=[image_block]
-        )
-
-
-# =========================
-# Cover + Poster (nouveaux films)
-# =========================
-
-def add_poster_and_backdrop(
-    page_id: str,
-    poster_url: str | None,
-    backdrop_url: str | None
-):
-    """
-    - Cover Notion = backdrop si dispo, sinon poster
-    - Poster vertical ajouté dans la page
-    - Aucun doublon
-    """
-
-    # 🎨 Cover explicite
-    cover_url = backdrop_url or poster_url
-    if cover_url:
-        notion.pages.update(
-            page_id=page_id,
-            cover={
-                "type": "external",
-                "external": {"url": cover_url}
-            }
-        )
-
-    # 📎 Poster dans le contenu
-    if not poster_url or page_has_image_url(page_id, poster_url):
-        return
-
-    blocks = notion.blocks.children.list(
-        block_id=page_id
-    ).get("results", [])
-
-    first_block_id = blocks[0]["id"] if blocks else None
-
-    add_image_block(
-        page_id,
-        poster_url,
-        after_block_id=first_block_id
-    )
-
-    time.sleep(0.25)
+    block_cache.append(page_id, [image_block], after=after_block_id)
 
 
 # =========================
@@ -210,7 +206,8 @@ def add_poster_and_backdrop(
 # =========================
 
 def set_page_cover(page_id: str, image_url: str):
-    notion.pages.update(
+    _call(
+        notion.pages.update,
         page_id=page_id,
         cover={
             "type": "external",
@@ -219,43 +216,51 @@ def set_page_cover(page_id: str, image_url: str):
     )
 
 
-def resync_covers_from_backdrop(pages: list[dict]):
-    """
-    One-shot safe :
-    - si la page a déjà une cover → on ne touche pas
-    - sinon, si une image backdrop existe → on la met en cover
-    """
-
-    for page in pages:
-        if page.get("cover"):
-            continue
-
-        page_id = page["id"]
-
-        blocks = notion.blocks.children.list(
-            block_id=page_id
-        ).get("results", [])
+def _resync_page_cover(film: FilmRecord):
+    page_id = film.id
+    images = list(block_cache.images(page_id))
+    # Job de masse : on ne garde pas les blocs de toute la base en mémoire
+    block_cache.invalidate(page_id)
 
-        for block in blocks:
-            if block.get("type") != "image":
-                continue
+    for url in images:
+        # Heuristique simple : image large = backdrop
+        if "w780" in url or "original" in url:
+            set_page_cover(page_id, url)
+            break
 
-            ext = block["image"].get("external", {})
-            url = ext.get("url", "")
 
-            # Heuristique simple : image large = backdrop
-            if "w780" in url or "original" in url:
-                set_page_cover(page_id, url)
-                time.sleep(0.25)
-                break
+def resync_covers_from_backdrop(
+    pages: list[FilmRecord],
+    *,
+    workers: int = 4,
+    checkpoint_path: str | None = None,
+    log=print
+) -> dict:
+    """
+    One-shot safe, parallèle et reprenable :
+    - si la page a déjà une cover → on ne touche pas (aucun appel)
+    - sinon, si une image backdrop existe → on la met en cover
+    - pages traitées sauvegardées : une relance reprend où on s'était arrêté
+    """
+    pending = [film for film in pages if not film.cover]
+    log(f"🖼️ Pages sans cover : {len(pending)} / {len(pages)}")
+
+    return run_bulk_job(
+        pending,
+        _resync_page_cover,
+        key=lambda film: film.id,
+        checkpoint_path=checkpoint_path or cache_path("resync_covers.txt"),
+        workers=workers,
+        label="Covers",
+        log=log
+    )
 
 
 # =========================
 # Mise à jour Notion
 # =========================
 
-def update_movie_page(
-    page_id: str,
+def build_movie_properties(
     *,
     title: str,
     synopsis: str,
@@ -291,7 +296,119 @@ def update_movie_page(
             "date": {"start": release_date.strftime("%Y-%m-%d")}
         }
 
-    notion.pages.update(
+    return properties
+
+
+def update_movie_page(page_id: str, **fields):
+    """fields : voir build_movie_properties"""
+    _call(
+        notion.pages.update,
         page_id=page_id,
-        properties=properties
+        properties=build_movie_properties(**fields)
     )
+
+
+# =========================
+# Enrichissement groupé (nouveaux films)
+# =========================
+
+def _property_value(prop: dict | None):
+    """Valeur comparable d'une propriété (page lue ou propriété à écrire)"""
+    if not prop:
+        return None
+
+    if "title" in prop or "rich_text" in prop:
+        parts = prop.get("title", prop.get("rich_text")) or []
+        return "".join(
+            p.get("plain_text") or p.get("text", {}).get("content", "")
+            for p in parts
+        )
+    if "select" in prop:
+        return (prop["select"] or {}).get("name")
+    if "multi_select" in prop:
+        return [o.get("name") for o in prop["multi_select"] or []]
+    if "checkbox" in prop:
+        return bool(prop["checkbox"])
+    if "date" in prop:
+        return ((prop["date"] or {}).get("start") or "")[:10] or None
+
+    return prop
+
+
+_UNKNOWN = object()
+
+# Propriétés dont la valeur actuelle est connue via le FilmRecord
+_RECORD_VALUES = {
+    "Nom": lambda f: f.title or "",
+    "TMDB_OK": lambda f: f.tmdb_ok,
+    "Catégorie": lambda f: list(f.categories),
+    "Tags": lambda f: list(f.tags),
+    "Date de sortie": lambda f: (
+        f.release_date.strftime("%Y-%m-%d") if f.release_date else None
+    ),
+}
+
+
+def _current_value(film: FilmRecord, name: str):
+    if film.raw is not None:
+        return _property_value(film.raw.get("properties", {}).get(name))
+    if name in _RECORD_VALUES:
+        return _RECORD_VALUES[name](film)
+    return _UNKNOWN
+
+
+def apply_film_enrichment(
+    film: FilmRecord,
+    *,
+    properties: dict,
+    cover_url: str | None,
+    poster_url: str | None
+) -> dict:
+    """
+    Propriétés + cover + poster en un minimum d'appels :
+    - un seul pages.update (propriétés modifiées + cover)
+    - un seul listing des blocs pour le poster
+    - rien n'est écrit si la page (état lu) est déjà à jour
+      (propriétés absentes du FilmRecord : toujours écrites, sauf keep_raw)
+    Retour : {"calls": appels faits, "saved": appels évités}
+    """
+    page_id = film.id
+
+    # Ancien enchaînement : update propriétés + update cover
+    # + 2 listings de blocs + append
+    baseline = 1 + bool(cover_url)
+    calls = 0
+
+    changed = {
+        name: prop for name, prop in properties.items()
+        if _current_value(film, name) != _property_value(prop)
+    }
+
+    update = {}
+    if changed:
+        update["properties"] = changed
+    if cover_url and film.cover != cover_url:
+        update["cover"] = {
+            "type": "external",
+            "external": {"url": cover_url}
+        }
+
+    if update:
+        _call(notion.pages.update, page_id=page_id, **update)
+        calls += 1
+
+    if poster_url:
+        calls += not block_cache.is_cached(page_id)
+
+        has_poster = page_has_image_url(page_id, poster_url)
+        baseline += 1 if has_poster else 3
+
+        if not has_poster:
+            add_image_block(
+                page_id,
+                poster_url,
+                after_block_id=block_cache.first_block_id(page_id)
+            )
+            calls += 1
+
+    return {"calls": calls, "saved": baseline - calls}
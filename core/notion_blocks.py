@@ -0,0 +1,137 @@
+import threading
+from collections import defaultdict
+
+from utils.rate_limit import governor
+
+_call = governor("notion").call
+
+
+def _image_url(block: dict) -> str | None:
+    if block.get("type") != "image":
+        return None
+    image = block.get("image", {})
+    return image.get(image.get("type", "external"), {}).get("url")
+
+
+class BlockCache:
+    """
+    Enfants (1er niveau) des pages Notion, lus une seule fois par run :
+    - pagination complète (start_cursor)
+    - index des images par URL externe
+    - les ajouts via append() mettent le cache à jour sur place
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._blocks = {}
+        self._images = {}
+        self._page_locks = defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+
+    def _page_lock(self, page_id: str):
+        with self._lock:
+            return self._page_locks[page_id]
+
+    def _fetch(self, page_id: str) -> list[dict]:
+        blocks = []
+        cursor = None
+
+        while True:
+            kwargs = {"block_id": page_id, "page_size": 100}
+            if cursor:
+                kwargs["start_cursor"] = cursor
+
+            response = _call(self.client.blocks.children.list, **kwargs)
+            blocks.extend(response.get("results", []))
+
+            if not response.get("has_more"):
+                return blocks
+
+            cursor = response.get("next_cursor")
+
+    def _index(self, page_id: str):
+        self._images[page_id] = {
+            url: block["id"]
+            for block in self._blocks[page_id]
+            if (url := _image_url(block))
+        }
+
+    # =========================
+    # Lecture
+    # =========================
+
+    def is_cached(self, page_id: str) -> bool:
+        return page_id in self._blocks
+
+    def children(self, page_id: str) -> list[dict]:
+        with self._page_lock(page_id):
+            if page_id not in self._blocks:
+                self._blocks[page_id] = self._fetch(page_id)
+                self._index(page_id)
+            return self._blocks[page_id]
+
+    def images(self, page_id: str) -> dict[str, str]:
+        """URL externe → id du bloc image"""
+        self.children(page_id)
+        return self._images[page_id]
+
+    def has_image(self, page_id: str, image_url: str) -> bool:
+        return image_url in self.images(page_id)
+
+    def first_block_id(self, page_id: str) -> str | None:
+        blocks = self.children(page_id)
+        return blocks[0]["id"] if blocks else None
+
+    # =========================
+    # Écriture
+    # =========================
+
+    def append(
+        self,
+        page_id: str,
+        children: list[dict],
+        *,
+        after: str | None = None
+    ) -> list[dict]:
+        kwargs = {"block_id": page_id, "children": children}
+        if after:
+            kwargs["after"] = after
+
+        created = _call(
+            self.client.blocks.children.append,
+            **kwargs
+        ).get("results", [])
+
+        with self._page_lock(page_id):
+            blocks = self._blocks.get(page_id)
+            if blocks is None:
+                return created
+
+            if not created:
+                # Réponse inattendue → relecture au prochain accès
+                self._blocks.pop(page_id, None)
+                self._images.pop(page_id, None)
+                return created
+
+            position = len(blocks)
+            if after:
+                for i, block in enumerate(blocks):
+                    if block["id"] == after:
+                        position = i + 1
+                        break
+
+            blocks[position:position] = created
+            self._index(page_id)
+
+        return created
+
+    def invalidate(self, page_id: str):
+        with self._page_lock(page_id):
+            self._blocks.pop(page_id, None)
+            self._images.pop(page_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._blocks.clear()
+            self._images.clear()
+            self._page_locks.clear()
@@ -0,0 +1,192 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+
+from core.film import FilmRecord
+from core.notion_paging import iter_database
+from utils.paths import cache_path
+
+# Scan complet périodique : seul moyen de voir les pages supprimées
+FULL_RESYNC_EVERY = timedelta(hours=24)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _parse_iso(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class NotionMirror:
+    """
+    Miroir local (SQLite) d'une base Notion.
+    - 1er lancement : scan complet
+    - ensuite : uniquement les pages éditées depuis le dernier last_edited_time
+    - pages archivées / supprimées : databases.query ne les renvoie pas,
+      elles ne sont retirées qu'au scan complet (FULL_RESYNC_EVERY ou full=True)
+    """
+
+    def __init__(self, client, database_id: str, path: str | None = None):
+        self.client = client
+        self.database_id = database_id
+        self.path = path or cache_path(f"notion_{database_id}.sqlite3")
+        self._lock = threading.Lock()
+        self._init_db()
+
+    # =========================
+    # SQLite
+    # =========================
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                " id TEXT PRIMARY KEY,"
+                " last_edited TEXT NOT NULL,"
+                " raw TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT)"
+            )
+
+    def _get_meta(self, conn, key: str) -> str | None:
+        row = conn.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, conn, key: str, value: str):
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value)
+        )
+
+    # =========================
+    # Notion
+    # =========================
+
+    def _query(self, query_filter: dict | None = None):
+        return iter_database(
+            self.client,
+            self.database_id,
+            query_filter=query_filter,
+            prefetch=True
+        )
+
+    # =========================
+    # Synchronisation
+    # =========================
+
+    def sync(self, *, full: bool = False) -> dict:
+        """
+        Met le miroir à jour.
+        Retour : {"mode", "updated", "removed"}
+        """
+        with self._lock, self._connect() as conn:
+            high_water = self._get_meta(conn, "high_water")
+            last_full = self._get_meta(conn, "last_full_sync")
+
+            if (
+                not high_water
+                or not last_full
+                or _utcnow() - _parse_iso(last_full) > FULL_RESYNC_EVERY
+            ):
+                full = True
+
+            if full:
+                return self._full_sync(conn)
+
+            return self._delta_sync(conn, high_water)
+
+    def _full_sync(self, conn) -> dict:
+        started = _utcnow().isoformat()
+        seen = set()
+        high_water = ""
+        updated = 0
+
+        for page in self._query():
+            if page.get("archived") or page.get("in_trash"):
+                continue
+            self._upsert(conn, page)
+            seen.add(page["id"])
+            high_water = max(high_water, page.get("last_edited_time", ""))
+            updated += 1
+
+        known = {row[0] for row in conn.execute("SELECT id FROM pages")}
+        removed = known - seen
+        conn.executemany(
+            "DELETE FROM pages WHERE id = ?",
+            [(page_id,) for page_id in removed]
+        )
+
+        self._set_meta(conn, "high_water", high_water or started)
+        self._set_meta(conn, "last_full_sync", started)
+
+        return {"mode": "full", "updated": updated, "removed": len(removed)}
+
+    def _delta_sync(self, conn, high_water: str) -> dict:
+        # on_or_after : Notion arrondit last_edited_time à la minute
+        delta_filter = {
+            "timestamp": "last_edited_time",
+            "last_edited_time": {"on_or_after": high_water}
+        }
+
+        updated = 0
+
+        for page in self._query(delta_filter):
+            self._upsert(conn, page)
+            high_water = max(high_water, page.get("last_edited_time", ""))
+            updated += 1
+
+        self._set_meta(conn, "high_water", high_water)
+
+        return {"mode": "delta", "updated": updated, "removed": 0}
+
+    def _upsert(self, conn, page: dict):
+        # ON CONFLICT conserve le rowid → ordre des pages stable
+        conn.execute(
+            "INSERT INTO pages (id, last_edited, raw) VALUES (?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET "
+            "last_edited = excluded.last_edited, raw = excluded.raw",
+            (
+                page["id"],
+                page.get("last_edited_time", ""),
+                json.dumps(page, ensure_ascii=False)
+            )
+        )
+
+    # =========================
+    # Lecture
+    # =========================
+
+    def iter_pages(self, *, full: bool = False, keep_raw: bool = False):
+        """
+        Synchronise puis parcourt les films un à un (FilmRecord).
+        keep_raw=True : JSON Notion conservé dans record.raw
+        """
+        self.sync(full=full)
+
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT raw FROM pages ORDER BY rowid")
+            for (raw,) in rows:
+                yield FilmRecord.from_page(json.loads(raw), keep_raw=keep_raw)
+        finally:
+            conn.close()
+
+    def pages(
+        self,
+        *,
+        full: bool = False,
+        keep_raw: bool = False
+    ) -> list[FilmRecord]:
+        """Synchronise puis retourne tous les films (FilmRecord)"""
+        return list(self.iter_pages(full=full, keep_raw=keep_raw))
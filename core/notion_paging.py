@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.rate_limit import governor
+
+# Maximum autorisé par l'API Notion
+MAX_PAGE_SIZE = 100
+
+
+def iter_database(
+    client,
+    database_id: str,
+    *,
+    query_filter: dict | None = None,
+    page_size: int = MAX_PAGE_SIZE,
+    prefetch: bool = False
+):
+    """
+    Générateur sur les pages d'une base Notion, lot par lot.
+    - page_size : taille des lots (≤ 100)
+    - prefetch  : le lot suivant est demandé en arrière-plan
+                  pendant que l'appelant traite le lot courant
+    Mémoire max : un lot (deux avec prefetch).
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+
+    def fetch(cursor):
+        kwargs = {
+            "database_id": database_id,
+            "start_cursor": cursor,
+            "page_size": page_size,
+        }
+        if query_filter:
+            kwargs["filter"] = query_filter
+        return governor("notion").call(client.databases.query, **kwargs)
+
+    if not prefetch:
+        cursor = None
+        while True:
+            response = fetch(cursor)
+            yield from response.get("results", [])
+
+            if not response.get("has_more"):
+                return
+
+            cursor = response.get("next_cursor")
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    pending = executor.submit(fetch, None)
+
+    try:
+        while pending:
+            response = pending.result()
+            pending = None
+
+            if response.get("has_more"):
+                pending = executor.submit(fetch, response.get("next_cursor"))
+
+            yield from response.get("results", [])
+    finally:
+        # Générateur abandonné en cours de route → lecture anticipée annulée
+        if pending:
+            pending.cancel()
+        executor.shutdown(wait=False)
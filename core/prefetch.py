@@ -0,0 +1,48 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LookAhead:
+    """
+    Parcourt `items` dans l'ordre en calculant fn(item) à l'avance
+    pour les `window` éléments suivants (threads en arrière-plan).
+    Itération : (item, Future du résultat).
+    cancel() : abandon du run, les calculs non démarrés sont annulés.
+    """
+
+    def __init__(self, items, fn, *, window: int = 3):
+        self._items = iter(items)
+        self._fn = fn
+        self._window = max(1, window)
+        self._queue = deque()
+        self._cancelled = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._window,
+            thread_name_prefix="lookahead"
+        )
+
+    def _fill(self):
+        while not self._cancelled and len(self._queue) < self._window:
+            try:
+                item = next(self._items)
+            except StopIteration:
+                return
+            self._queue.append((item, self._executor.submit(self._fn, item)))
+
+    def __iter__(self):
+        try:
+            self._fill()
+            while self._queue and not self._cancelled:
+                item, future = self._queue.popleft()
+                # L'élément courant part, le suivant entre dans la fenêtre
+                self._fill()
+                yield item, future
+        finally:
+            self.cancel()
+
+    def cancel(self):
+        self._cancelled = True
+        while self._queue:
+            _, future = self._queue.popleft()
+            future.cancel()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,72 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+from core.film import FilmRecord
+from utils.paths import cache_path
+
+
+class ReviewQueue:
+    """
+    Films ambigus mis de côté par l'enrichissement sans interface,
+    avec leurs candidats TMDB classés, pour une session de revue ultérieure.
+    Fichier JSON : {page_id: entrée}, relu à chaque opération :
+    la file peut être remplie par un autre processus (CLI sans interface)
+    pendant que l'application est ouverte.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or cache_path("review_queue.json")
+        self._lock = threading.Lock()
+        self._items = {}
+
+    def _load(self):
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self._items = json.load(f)
+        else:
+            self._items = {}
+
+    def _save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._items, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def __len__(self):
+        with self._lock:
+            self._load()
+            return len(self._items)
+
+    def __contains__(self, page_id: str):
+        with self._lock:
+            self._load()
+            return page_id in self._items
+
+    def add(self, film: FilmRecord, decision: dict, *, reason: str):
+        """decision : résultat de core.tmdb.find_candidates"""
+        ranking = decision.get("ranking")
+
+        with self._lock:
+            self._load()
+            self._items[film.id] = {
+                "page_id": film.id,
+                "title": film.title,
+                "candidates": decision.get("results", []),
+                "scores": ranking.scores if ranking else [],
+                "reason": reason,
+                "queued_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            self._save()
+
+    def items(self) -> list[dict]:
+        with self._lock:
+            self._load()
+            return list(self._items.values())
+
+    def discard(self, page_id: str):
+        with self._lock:
+            self._load()
+            if self._items.pop(page_id, None) is not None:
+                self._save()
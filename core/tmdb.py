@@ -1,23 +1,326 @@
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
 from math import log10
 from config import TMDB_API_KEY
-from utils.text import clean_search_title, similarity
+from core.tmdb_index import get_title_index
+from utils.text import clean_search_title, extract_year, similarity
 from utils.request import safe_get_json
+from utils.similarity import ratio_at_least
+
+# Candidats tirés de l'index local (détails TMDB pour chacun)
+LOCAL_SEARCH_LIMIT = 3
+
+# Popularité minimale d'un résultat local pour se passer de /search/movie
+# (l'index ne connaît que original_title : un film obscur peut porter
+# le titre français d'un film connu)
+LOCAL_MIN_POPULARITY = 10.0
+
+def search_local(title, year=None) -> list[dict]:
+    """
+    Titre exact dans l'index TMDB hors ligne → détails des films trouvés.
+    [] si pas d'index, pas de correspondance ou année différente.
+    """
+    index = get_title_index()
+    if not index:
+        return []
+
+    movies = [
+        details for hit in index.exact(title, LOCAL_SEARCH_LIMIT)
+        if (details := get_movie_details(hit["id"]))
+    ]
+    if year:
+        movies = [
+            m for m in movies
+            if (m.get("release_date") or "")[:4] == str(year)
+        ]
+    return movies
+
+def _search(title, year, language, local_first) -> tuple[list[dict], bool]:
+    """(résultats, uniquement issus de l'index local ?)"""
+    local = search_local(title, year) if local_first else []
+    if local and max(m.get("popularity", 0) for m in local) >= LOCAL_MIN_POPULARITY:
+        return local, True
 
-def search_movie(title, year=None, language="fr-FR"):
     url = (
         "https://api.themoviedb.org/3/search/movie"
         f"?api_key={TMDB_API_KEY}&query={title}&language={language}"
     )
     if year:
         url += f"&year={year}"
-    return safe_get_json(url).get("results", [])
+    results = safe_get_json(url).get("results", [])
+
+    # Résultats locaux peu populaires : candidats en plus, jamais à la place
+    known = {m["id"] for m in results}
+    return results + [m for m in local if m["id"] not in known], False
+
+def search_movie(title, year=None, language="fr-FR", *, local_first=True):
+    return _search(title, year, language, local_first)[0]
 
 def score_movie(movie, query):
-    sim = max(
-        similarity(clean_search_title(movie.get("title", "")), query),
-        similarity(clean_search_title(movie.get("original_title", "")), query)
+    """Score d'un seul candidat (voir rank_candidates pour un lot)"""
+    return rank_candidates([movie], query).scores[0]
+
+# =========================
+# Classement des candidats
+# =========================
+
+# Seuils d'auto-pick (score / écart avec le 2e)
+AUTO_PICK_SCORE = 0.85
+AUTO_PICK_MARGIN = 0.20
+AUTO_PICK_POPULAR_SCORE = 0.75
+AUTO_PICK_POPULAR_VOTES = 2000
+
+@lru_cache(maxsize=4096)
+def _clean(title: str) -> str:
+    return clean_search_title(title)
+
+@dataclass(slots=True)
+class Ranking:
+    """Candidats TMDB triés une fois, scores alignés sur `movies`"""
+
+    query: str
+    movies: list[dict]
+    scores: list[float]
+    # False : un candidat unique n'est pas validé d'office (index local seul)
+    single_pick: bool = True
+
+    @property
+    def best(self) -> dict | None:
+        return self.movies[0] if self.movies else None
+
+    @property
+    def margin(self) -> float:
+        """Écart de score entre le 1er et le 2e candidat"""
+        if not self.scores:
+            return 0.0
+        second = self.scores[1] if len(self.scores) > 1 else 0
+        return self.scores[0] - second
+
+    def top(self, n: int) -> "Ranking":
+        return Ranking(
+            self.query, self.movies[:n], self.scores[:n], self.single_pick
+        )
+
+    def auto_pick(self) -> dict | None:
+        if not self.movies:
+            return None
+
+        best, best_score = self.movies[0], self.scores[0]
+        single = len(self.movies) == 1
+
+        if single and self.single_pick:
+            return best
+
+        # Candidat local unique : l'écart avec un 2e inexistant ne prouve rien
+        if (
+                not single
+                and best_score >= AUTO_PICK_SCORE
+                and self.margin >= AUTO_PICK_MARGIN
+        ):
+            return best
+
+        if (
+                best_score >= AUTO_PICK_POPULAR_SCORE
+                and best.get("vote_count", 0) >= AUTO_PICK_POPULAR_VOTES
+        ):
+            return best
+
+        return None
+
+def rank_candidates(results: list[dict], title: str) -> Ranking:
+    """
+    Score de tous les candidats en un passage :
+    requête nettoyée une fois, caractéristiques calculées par colonne.
+    """
+    query = _clean(title)
+
+    sims = [
+        max(
+            similarity(_clean(m.get("title") or ""), query),
+            similarity(_clean(m.get("original_title") or ""), query)
+        )
+        for m in results
+    ]
+    pops = [m.get("popularity", 0) / 100 for m in results]
+    votes = [m.get("vote_average", 0) / 10 for m in results]
+    counts = [log10(1 + m.get("vote_count", 0)) / 4 for m in results]
+
+    scores = [
+        3*sim + 1.6*vote + 0.9*pop + 0.6*cnt
+        for sim, vote, pop, cnt in zip(sims, votes, pops, counts)
+    ]
+
+    order = sorted(range(len(results)), key=scores.__getitem__, reverse=True)
+    return Ranking(
+        query,
+        [results[i] for i in order],
+        [scores[i] for i in order]
+    )
+
+def rank_many(batch) -> list[Ranking]:
+    """Classement en masse : batch = [(titre, résultats TMDB), ...]"""
+    return [rank_candidates(results, title) for title, results in batch]
+
+def normalize_title(title: str) -> str:
+    title = unicodedata.normalize("NFKD", title)
+    title = "".join(c for c in title if not unicodedata.combining(c))
+    title = title.lower()
+    title = re.sub(r"[^a-z0-9 ]", "", title)
+    title = re.sub(r"\s+", " ", title).strip()
+    return title
+
+def title_matches(notion_title: str, tmdb_title: str) -> bool:
+    return ratio_at_least(
+        normalize_title(notion_title),
+        normalize_title(tmdb_title),
+        0.85
+    )
+
+def is_released_tmdb(movie: dict) -> bool:
+    date_str = movie.get("release_date")
+    if not date_str:
+        return False
+    try:
+        release_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+    except ValueError:
+        return False
+    return release_date <= datetime.now().date()
+
+def auto_pick_movie(results: list[dict], title: str) -> dict | None:
+    return rank_candidates(results, title).auto_pick()
+
+def find_candidates(title: str) -> dict:
+    """
+    Recherche TMDB d'un titre Notion + décision automatique :
+    {"results": 10 meilleurs candidats triés, "pick": film validé ou None,
+     "ranking": classement (scores, marge)}
+    Sans auto-pick, les détails des candidats sont préchargés
+    (réalisateurs du choix manuel).
+    """
+    results, local_only = _search(
+        clean_search_title(title), extract_year(title), "fr-FR", True
+    )
+    ranking = rank_candidates(results, title).top(10)
+    ranking.single_pick = not local_only
+    results = ranking.movies
+
+    if not results:
+        return {"results": [], "pick": None, "ranking": ranking}
+
+    candidate = ranking.auto_pick()
+
+    if (
+            candidate
+            and is_released_tmdb(candidate)
+            and title_matches(title, candidate.get("title", ""))
+    ):
+        return {"results": results, "pick": candidate, "ranking": ranking}
+
+    for m in results:
+        get_movie_details(m["id"])
+
+    return {"results": results, "pick": None, "ranking": ranking}
+
+# Détails mémoïsés par ID TMDB pour tout le run
+_details = {}
+_details_lock = threading.Lock()
+
+def get_movie_details(movie_id) -> dict | None:
+    """
+    Détails + crédits + dates de sortie + IDs externes en une requête
+    (append_to_response). None si TMDB ne répond pas.
+    """
+    movie_id = int(movie_id)
+    with _details_lock:
+        if movie_id in _details:
+            return _details[movie_id]
+
+    url = (
+        f"https://api.themoviedb.org/3/movie/{movie_id}"
+        f"?api_key={TMDB_API_KEY}&language=fr-FR"
+        "&append_to_response=credits,release_dates,external_ids"
+    )
+    data = safe_get_json(url)
+    if data.get("_error"):
+        return None
+
+    with _details_lock:
+        _details[movie_id] = data
+    return data
+
+def reset_details_memo():
+    with _details_lock:
+        _details.clear()
+
+def director_from_details(details: dict | None) -> str:
+    for crew in (details or {}).get("credits", {}).get("crew", []):
+        if crew.get("job") == "Director":
+            return crew.get("name", "")
+    return ""
+
+def genres_from_details(details: dict | None) -> list[str]:
+    return [g["name"] for g in (details or {}).get("genres", [])]
+
+# Genres TMDB (id → nom français), chargés une fois
+_genre_map = {}
+_genre_lock = threading.Lock()
+_genre_refreshed = threading.Event()
+
+def get_genre_map(*, refresh: bool = False) -> dict[int, str]:
+    """Liste des genres (cache disque longue durée)"""
+    with _genre_lock:
+        if _genre_map and not refresh:
+            return _genre_map
+
+        url = (
+            "https://api.themoviedb.org/3/genre/movie/list"
+            f"?api_key={TMDB_API_KEY}&language=fr-FR"
+        )
+        data = safe_get_json(url, use_cache=not refresh)
+        if not data.get("_error"):
+            _genre_map.update(
+                {g["id"]: g["name"] for g in data.get("genres", [])}
+            )
+        return _genre_map
+
+def genres_from_ids(genre_ids: list[int]) -> list[str]:
+    """genre_ids (recherche, /find) → noms, sans requête par film"""
+    genre_map = get_genre_map()
+    if (
+            any(g not in genre_map for g in genre_ids)
+            and not _genre_refreshed.is_set()
+    ):
+        # Genre inconnu → liste rechargée (une seule fois)
+        _genre_refreshed.set()
+        genre_map = get_genre_map(refresh=True)
+    return [genre_map[g] for g in genre_ids if g in genre_map]
+
+def movie_genres(movie: dict) -> list[str]:
+    """Genres d'un film TMDB, résolus localement si possible"""
+    if "genre_ids" in movie:
+        return genres_from_ids(movie["genre_ids"])
+    if "genres" in movie:
+        return genres_from_details(movie)
+    return get_movie_genres(movie["id"])
+
+def get_director(movie_id: int) -> str:
+    return director_from_details(get_movie_details(movie_id))
+
+def get_movie_genres(movie_id: int) -> list[str]:
+    return genres_from_details(get_movie_details(movie_id))
+
+def get_movie_poster_url(movie: dict) -> str | None:
+    return (
+        f"https://image.tmdb.org/t/p/w500{movie['poster_path']}"
+        if movie.get("poster_path") else None
+    )
+
+def get_movie_backdrop_url(movie: dict) -> str | None:
+    return (
+        f"https://image.tmdb.org/t/p/w780{movie['backdrop_path']}"
+        if movie.get("backdrop_path") else None
     )
-    pop = movie.get("popularity", 0) / 100
-    vote = movie.get("vote_average", 0) / 10
-    cnt = log10(1 + movie.get("vote_count", 0)) / 4
-    return 3*sim + 1.6*vote + 0.9*pop + 0.6*cnt
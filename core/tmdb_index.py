@@ -0,0 +1,175 @@
+import gzip
+import json
+import os
+import sqlite3
+
+from utils.paths import cache_path
+from utils.similarity import ratio
+from utils.text import normalize_title
+
+# Export quotidien TMDB :
+# http://files.tmdb.org/p/exports/movie_ids_MM_DD_YYYY.json.gz
+DEFAULT_INDEX = "tmdb_titles.sqlite3"
+
+# Trigrammes seulement pour les films assez connus (taille de l'index)
+TRIGRAM_MIN_POPULARITY = 1.0
+
+_BATCH = 5000
+
+
+def _trigrams(norm: str) -> set[str]:
+    padded = f"  {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# =========================
+# Import
+# =========================
+
+def build_index(
+    export_path: str,
+    index_path: str | None = None,
+    *,
+    trigram_min_popularity: float = TRIGRAM_MIN_POPULARITY,
+    log=print
+) -> int:
+    """
+    Export movie_ids_*.json.gz → index SQLite (lecture en flux, ligne par ligne).
+    Retour : nombre de films indexés.
+    """
+    index_path = index_path or cache_path(DEFAULT_INDEX)
+    tmp_path = index_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute(
+        "CREATE TABLE titles ("
+        " id INTEGER PRIMARY KEY,"
+        " title TEXT NOT NULL,"
+        " norm TEXT NOT NULL,"
+        " popularity REAL NOT NULL)"
+    )
+    conn.execute(
+        "CREATE TABLE trigrams ("
+        " tri TEXT NOT NULL,"
+        " id INTEGER NOT NULL,"
+        " PRIMARY KEY (tri, id)) WITHOUT ROWID"
+    )
+
+    titles = []
+    trigrams = []
+    count = 0
+
+    def flush():
+        conn.executemany("INSERT OR REPLACE INTO titles VALUES (?, ?, ?, ?)", titles)
+        conn.executemany("INSERT OR IGNORE INTO trigrams VALUES (?, ?)", trigrams)
+        conn.commit()
+        titles.clear()
+        trigrams.clear()
+
+    with gzip.open(export_path, "rt", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+
+            if entry.get("adult") or entry.get("video"):
+                continue
+
+            title = entry.get("original_title") or ""
+            norm = normalize_title(title)
+            if not norm:
+                continue
+
+            popularity = float(entry.get("popularity") or 0)
+            titles.append((entry["id"], title, norm, popularity))
+
+            if popularity >= trigram_min_popularity:
+                trigrams.extend((tri, entry["id"]) for tri in _trigrams(norm))
+
+            count += 1
+            if len(titles) >= _BATCH:
+                flush()
+                if count % (_BATCH * 20) == 0:
+                    log(f"📥 {count} films indexés…")
+
+    flush()
+    conn.execute("CREATE INDEX titles_norm ON titles (norm)")
+    conn.commit()
+    conn.close()
+
+    os.replace(tmp_path, index_path)
+    return count
+
+
+# =========================
+# Recherche locale
+# =========================
+
+class TitleIndex:
+    """Recherche de films TMDB par titre, sans réseau"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(
+            f"file:{path}?mode=ro",
+            uri=True,
+            check_same_thread=False
+        )
+
+    def exact(self, title: str, limit: int = 10) -> list[dict]:
+        """Titre normalisé identique, par popularité décroissante"""
+        rows = self._conn.execute(
+            "SELECT id, title, popularity FROM titles WHERE norm = ? "
+            "ORDER BY popularity DESC LIMIT ?",
+            (normalize_title(title), limit)
+        ).fetchall()
+        return [{"id": i, "title": t, "popularity": p} for i, t, p in rows]
+
+    def fuzzy(self, title: str, limit: int = 10, *, pool: int = 50) -> list[dict]:
+        """Candidats par trigrammes communs, reclassés par similarité"""
+        norm = normalize_title(title)
+        tris = sorted(_trigrams(norm))
+        if not tris:
+            return []
+
+        placeholders = ",".join("?" * len(tris))
+        rows = self._conn.execute(
+            "SELECT t.id, t.title, t.norm, t.popularity FROM ("
+            f" SELECT id, COUNT(*) AS hits FROM trigrams WHERE tri IN ({placeholders})"
+            " GROUP BY id ORDER BY hits DESC LIMIT ?"
+            ") AS c JOIN titles AS t ON t.id = c.id",
+            (*tris, pool)
+        ).fetchall()
+
+        scored = sorted(
+            rows,
+            key=lambda r: (ratio(norm, r[2]), r[3]),
+            reverse=True
+        )[:limit]
+        return [
+            {"id": i, "title": t, "popularity": p, "score": ratio(norm, n)}
+            for i, t, n, p in scored
+        ]
+
+    def lookup(self, title: str, limit: int = 10) -> list[dict]:
+        return self.exact(title, limit) or self.fuzzy(title, limit)
+
+
+_index = None
+
+
+def get_title_index(path: str | None = None) -> TitleIndex | None:
+    """Index local s'il a été importé (scripts/import_tmdb_export.py)"""
+    global _index
+    path = path or cache_path(DEFAULT_INDEX)
+
+    if _index is None or _index.path != path:
+        if not os.path.exists(path):
+            return None
+        _index = TitleIndex(path)
+    return _index
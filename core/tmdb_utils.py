@@ -1,6 +1,7 @@
 import re
 import os
-import requests
+
+from utils.request import safe_get_json
 
 TMDB_API_KEY = os.getenv("TMDB_API_KEY")
 
@@ -22,8 +23,8 @@ def get_movie_by_tmdb_id(tmdb_id: str) -> dict | None:
         "language": "fr-FR"
     }
 
-    r = requests.get(url, params=params, timeout=10)
-    return r.json() if r.ok else None
+    data = safe_get_json(url, params=params)
+    return None if data.get("_error") else data
 
 
 def get_tmdb_movie_from_imdb_id(imdb_id: str) -> dict | None:
@@ -34,10 +35,9 @@ def get_tmdb_movie_from_imdb_id(imdb_id: str) -> dict | None:
         "language": "fr-FR"
     }
 
-    r = requests.get(url, params=params, timeout=10)
-    if not r.ok:
+    data = safe_get_json(url, params=params)
+    if data.get("_error"):
         return None
 
-    data = r.json()
     movies = data.get("movie_results", [])
     return movies[0] if movies else None
@@ -0,0 +1,126 @@
+import os
+import random
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from services.nas_matcher import NasMatcher
+from services.nas_scanner import movie_record, normalize_title, extract_year
+
+# =====================
+# PARAMÈTRES
+# =====================
+
+FILMS = 10_000
+TITLES = 10_000
+LEGACY_SAMPLE = 500   # titres passés à l'ancienne boucle (extrapolée)
+
+SYLLABLES = (
+    "ba be bi bo bu da de di do du fa fe fi fo ga go la le li lo lu "
+    "ma me mi mo mu na ne ni no pa pe pi po ra re ri ro sa se si so "
+    "ta te ti to va ve vi vo ar er ir or an en in on"
+).split()
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4)))
+
+
+def _title(rng: random.Random, words: list[str]) -> str:
+    return " ".join(rng.choice(words) for _ in range(rng.randint(1, 4))).title()
+
+
+def _dataset(rng: random.Random):
+    words = list({_word(rng) for _ in range(3000)})
+    titles = {}
+    while len(titles) < FILMS:
+        titles[_title(rng, words)] = str(rng.randint(1950, 2024))
+
+    movies = [
+        movie_record(os.path.join("H:\\Movies", f"{title} ({year}).mkv"))
+        for title, year in titles.items()
+    ]
+
+    known = list(titles.items())
+    queries = []
+    for _ in range(TITLES):
+        title, year = rng.choice(known)
+        roll = rng.random()
+        if roll < 0.4:
+            queries.append(title)
+        elif roll < 0.7:
+            queries.append(f"{title} ({year})")
+        elif roll < 0.8:
+            queries.append(title.replace("e", "é", 1))
+        elif roll < 0.85:
+            # Titre Notion abrégé : sous-chaîne du nom de fichier
+            queries.append(title.rsplit(" ", 1)[0])
+        else:
+            queries.append(_title(rng, words) + " Inédit")
+    return movies, queries
+
+
+def find_match(notion_title, nas_movies):
+    """Ancienne implémentation (scripts/sync_nas_to_notion.py)"""
+    norm_title = normalize_title(notion_title)
+    year = extract_year(notion_title)
+
+    for movie in nas_movies:
+        if norm_title in movie["normalized"]:
+            if not year or year == movie["year"]:
+                return movie
+
+    return None
+
+
+def main():
+    rng = random.Random(42)
+    movies, queries = _dataset(rng)
+
+    start = time.perf_counter()
+    legacy = [find_match(q, movies) for q in queries[:LEGACY_SAMPLE]]
+    t_legacy = (time.perf_counter() - start) * len(queries) / LEGACY_SAMPLE
+    print(f"Boucle actuelle : {t_legacy:7.2f} s (extrapolé, {FILMS} × {TITLES})")
+
+    start = time.perf_counter()
+    matcher = NasMatcher(movies)
+    t_build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [matcher.match(q) for q in queries]
+    t_match = time.perf_counter() - start
+    print(
+        f"Index           : {t_build + t_match:7.2f} s "
+        f"(construction {t_build:.2f} s) → x{t_legacy / (t_build + t_match):.0f}"
+    )
+
+    # Sur l'échantillon : même film, ou meilleur (titre exact)
+    same = exact_better = only_legacy = only_index = 0
+    for query, old, new in zip(queries, legacy, indexed):
+        if old is None and new is None:
+            continue
+        if old is None:
+            only_index += 1
+        elif new is None:
+            only_legacy += 1
+        elif old["path"] == new["path"]:
+            same += 1
+        elif normalize_title(query) == normalize_title(new["filename"][:-4]):
+            exact_better += 1
+
+    print(f"Même film                     : {same}")
+    print(f"Meilleur film (titre exact)   : {exact_better}")
+    print(f"Trouvé par l'index seulement  : {only_index}")
+    print(f"Trouvé par la boucle seulement: {only_legacy}")
+
+
+# =====================
+# CLI ENTRY POINT
+# =====================
+# python scripts/bench_nas_matcher.py
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from services.nas_index import NasIndex
+from services.nas_scanner import (
+    VIDEO_EXTS,
+    normalize_title,
+    extract_year,
+    scan_nas_movies,
+)
+
+# =====================
+# PARAMÈTRES
+# =====================
+
+FILMS = 1000
+LATENCY = 0.005   # secondes par listing (aller-retour SMB simulé)
+
+
+def _build_tree(root: str):
+    """Une arborescence type NAS : lettre / film / fichiers"""
+    for i in range(FILMS):
+        title = f"Film {i:05d} ({1970 + i % 55})"
+        folder = os.path.join(root, title[0:6], title)
+        os.makedirs(folder, exist_ok=True)
+
+        for name in (f"{title}.mkv", f"{title}.srt", "poster.jpg"):
+            open(os.path.join(folder, name), "w").close()
+
+        if i % 10 == 0:
+            extras = os.path.join(folder, "Extras")
+            os.makedirs(extras, exist_ok=True)
+            open(os.path.join(extras, "Making of.mp4"), "w").close()
+
+
+def _scan_walk(base_path: str) -> list[dict]:
+    """Ancienne implémentation (os.walk mono-thread)"""
+    movies = []
+    for root, _, files in os.walk(base_path):
+        for f in files:
+            if f.lower().endswith(VIDEO_EXTS):
+                movies.append({
+                    "path": os.path.join(root, f),
+                    "filename": f,
+                    "normalized": normalize_title(f),
+                    "year": extract_year(f),
+                })
+    return movies
+
+
+def _slow_scandir(real_scandir):
+    # os.walk passe aussi par os.scandir : même latence pour les deux
+    def scandir(path="."):
+        time.sleep(LATENCY)
+        return real_scandir(path)
+    return scandir
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        _build_tree(root)
+
+        real_scandir = os.scandir
+        os.scandir = _slow_scandir(real_scandir)
+        try:
+            reference, t_walk = _timed(lambda: _scan_walk(root))
+            print(f"os.walk               : {t_walk:6.2f} s ({len(reference)} films)")
+
+            for workers in (4, 8, 16, 32):
+                ordered, t = _timed(
+                    lambda: scan_nas_movies(root, workers=workers)
+                )
+                assert ordered == reference
+                print(
+                    f"scandir x{workers:<2} (ordonné) : {t:6.2f} s"
+                    f"  → x{t_walk / t:.1f}"
+                )
+
+            unordered, t = _timed(
+                lambda: scan_nas_movies(root, workers=16, ordered=False)
+            )
+            key = lambda m: m["path"]
+            assert sorted(unordered, key=key) == sorted(reference, key=key)
+            print(f"scandir x16 (libre)   : {t:6.2f} s  → x{t_walk / t:.1f}")
+
+            # Index persistant : 1er scan puis rescan sans changement
+            index_path = os.path.join(root, "nas_index.json")
+            _, t = _timed(lambda: NasIndex(root, index_path).refresh())
+            print(f"index (1er scan)      : {t:6.2f} s")
+
+            index = NasIndex(root, index_path)
+            delta, t = _timed(index.refresh)
+            assert not delta
+            assert sorted(m["path"] for m in index.movies()) == sorted(
+                m["path"] for m in reference
+            )
+            print(
+                f"index (rescan)        : {t:6.2f} s  → x{t_walk / t:.1f}"
+                f"  ({delta.dirs_listed}/{delta.dirs_checked} dossiers listés)"
+            )
+        finally:
+            os.scandir = real_scandir
+
+
+# =====================
+# CLI ENTRY POINT
+# =====================
+# python scripts/bench_nas_scanner.py
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import os
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.similarity import ratio, cache_clear, _Indel
+from utils.text import clean_search_title
+
+# =====================
+# JEU DE TITRES
+# =====================
+
+TITLES = [
+    "Inception", "Interstellar", "The Dark Knight", "The Dark Knight Rises",
+    "Le Seigneur des anneaux : La Communauté de l'anneau",
+    "Le Seigneur des anneaux : Les Deux Tours",
+    "Le Seigneur des anneaux : Le Retour du roi",
+    "Le Fabuleux Destin d'Amélie Poulain", "Intouchables", "La Haine",
+    "Le Dîner de cons", "Les Visiteurs", "Les Visiteurs 2",
+    "Astérix & Obélix : Mission Cléopâtre", "La Cité de la peur",
+    "Pulp Fiction", "Reservoir Dogs", "Kill Bill : Volume 1",
+    "Kill Bill : Volume 2", "Retour vers le futur", "Retour vers le futur II",
+    "Star Wars : Un nouvel espoir", "L'Empire contre-attaque",
+    "Le Parrain", "Le Parrain, 2e partie", "Les Évadés", "Fight Club",
+    "Le Voyage de Chihiro", "Princesse Mononoké", "Mon voisin Totoro",
+    "Blade Runner", "Blade Runner 2049", "Alien, le huitième passager",
+    "Aliens, le retour", "Les Dents de la mer", "E.T. l'extra-terrestre",
+    "Jurassic Park", "Le Monde perdu : Jurassic Park", "Titanic", "Avatar",
+]
+
+
+def _variants(title: str, rng: random.Random) -> list[str]:
+    """Requêtes bruitées façon titres Notion"""
+    t = clean_search_title(title)
+    words = t.split()
+    out = [t, t + f" ({rng.randint(1970, 2024)})"]
+    if len(words) > 1:
+        out.append(" ".join(words[:-1]))
+    out.append(t.replace("e", "é", 1))
+    return [clean_search_title(v) for v in out]
+
+
+def _rank(scorer, query, candidates):
+    return sorted(candidates, key=lambda c: scorer(query, c), reverse=True)
+
+
+def main():
+    rng = random.Random(42)
+    candidates = [clean_search_title(t) for t in TITLES]
+    queries = [v for t in TITLES for v in _variants(t, rng)]
+
+    def seq(a, b):
+        return SequenceMatcher(None, a, b).ratio()
+
+    # --- Accord du classement ---
+    same_top = 0
+    for q in queries:
+        if _rank(seq, q, candidates)[0] == _rank(ratio, q, candidates)[0]:
+            same_top += 1
+
+    pairs = [(q, c) for q in queries for c in candidates]
+
+    # --- Vitesse ---
+    t = time.perf_counter()
+    for a, b in pairs:
+        seq(a, b)
+    t_seq = time.perf_counter() - t
+
+    cache_clear()
+    t = time.perf_counter()
+    for a, b in pairs:
+        ratio(a, b)
+    t_cold = time.perf_counter() - t
+
+    t = time.perf_counter()
+    for a, b in pairs:
+        ratio(a, b)
+    t_warm = time.perf_counter() - t
+
+    backend = "rapidfuzz" if _Indel else "LCS bit-parallèle (pur Python)"
+    print(f"Backend              : {backend}")
+    print(f"Paires comparées     : {len(pairs)}")
+    print(f"Même 1er candidat    : {same_top}/{len(queries)}")
+    print(f"SequenceMatcher      : {t_seq * 1000:.1f} ms")
+    print(f"ratio (cache vide)   : {t_cold * 1000:.1f} ms "
+          f"→ ×{t_seq / t_cold:.1f}")
+    print(f"ratio (cache chaud)  : {t_warm * 1000:.1f} ms "
+          f"→ ×{t_seq / t_warm:.1f}")
+
+
+if __name__ == "__main__":
+    main()
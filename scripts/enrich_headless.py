@@ -0,0 +1,28 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.batch import run_batch_enrichment
+
+# =====================
+# CLI ENTRY POINT
+# =====================
+# python scripts/enrich_headless.py [--requeue] [--no-calendar]
+# Les films ambigus sont à traiter ensuite dans l'application
+# (bouton « File de revue »).
+
+if __name__ == "__main__":
+    print("🚀 Enrichissement TMDB sans interface")
+
+    stats = run_batch_enrichment(
+        requeue="--requeue" in sys.argv,
+        calendar="--no-calendar" not in sys.argv
+    )
+
+    print("\n=====================")
+    print(f"✅ Films enrichis       : {stats['applied']}")
+    print(f"📋 En file de revue     : {stats['queued']}")
+    print(f"❌ Erreurs              : {stats['errors']}")
@@ -0,0 +1,25 @@
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.tmdb_index import build_index
+
+# =====================
+# CLI ENTRY POINT
+# =====================
+# Export à télécharger :
+# http://files.tmdb.org/p/exports/movie_ids_MM_DD_YYYY.json.gz
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage : python scripts/import_tmdb_export.py movie_ids_XX_XX_XXXX.json.gz")
+        sys.exit(1)
+
+    started = time.monotonic()
+    print(f"📦 Import de {sys.argv[1]}…")
+    count = build_index(sys.argv[1])
+    print(f"✅ {count} films indexés en {time.monotonic() - started:.0f}s")
@@ -0,0 +1,26 @@
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from core.notion import fetch_all_pages, resync_covers_from_backdrop
+
+# =====================
+# CLI ENTRY POINT
+# =====================
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+
+    print("📡 Chargement des films Notion...")
+    # Scan complet : écrit dans les pages, donc sans films supprimés / archivés
+    pages = fetch_all_pages(full=True)
+
+    stats = resync_covers_from_backdrop(pages, workers=workers)
+
+    print("\n=====================")
+    print(f"✅ Pages traitées : {stats['done']}")
+    print(f"⏩ Déjà faites    : {stats['skipped']}")
+    print(f"❌ Erreurs        : {stats['errors']}")
@@ -31,46 +31,18 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from services.nas_scanner import (
-    scan_nas_movies,
-    normalize_title,
-    extract_year
-)
+from services.nas_index import NasIndex
+from services.nas_matcher import NasMatcher
+from core.notion_mirror import NotionMirror
 
 # =====================
 # NOTION FETCH
 # =====================
 
 def fetch_notion_films():
-    results = []
-    cursor = None
-
-    while True:
-        response = notion.databases.query(
-            database_id=DATABASE_ID,
-            start_cursor=cursor
-        )
-        results.extend(response["results"])
-        cursor = response.get("next_cursor")
-        if not cursor:
-            break
-
-    return results
-
-# =====================
-# MATCHING
-# =====================
-
-def find_match(notion_title, nas_movies):
-    norm_title = normalize_title(notion_title)
-    year = extract_year(notion_title)
-
-    for movie in nas_movies:
-        if norm_title in movie["normalized"]:
-            if not year or year == movie["year"]:
-                return movie
-
-    return None
+    # Miroir local : seules les pages modifiées depuis la dernière sync
+    # Itérateur : les pages sont traitées au fil de la lecture
+    return NotionMirror(notion, DATABASE_ID).iter_pages()
 
 # =====================
 # PATH BUILDERS (INFO ONLY)
@@ -92,28 +64,34 @@ def build_paths(local_path: str):
 # SYNC CORE (READ-ONLY)
 # =====================
 
-def sync_nas_to_notion():
+def sync_nas_to_notion(index: NasIndex | None = None):
     print("🔍 Scan du NAS local...")
-    nas_movies = scan_nas_movies(NAS_ROOT_LOCAL)
-    print(f"🎞️ {len(nas_movies)} fichiers trouvés")
+    # Index persistant : seuls les dossiers modifiés sont re-listés
+    index = index or NasIndex(NAS_ROOT_LOCAL)
+    delta = index.refresh()
+    nas_movies = index.movies()
+    print(
+        f"🎞️ {len(nas_movies)} fichiers trouvés "
+        f"(+{len(delta.added)} / -{len(delta.removed)} / "
+        f"↪ {len(delta.renamed)} depuis le dernier scan)"
+    )
+
+    # Index construit une fois : un titre Notion → meilleur fichier NAS
+    matcher = NasMatcher(nas_movies)
 
     print("📡 Chargement des films Notion...")
-    notion_films = fetch_notion_films()
-    print(f"📄 {len(notion_films)} pages Notion")
 
     found = 0
     missing = 0
+    total = 0
 
-    for film in notion_films:
-        props = film["properties"]
-        title_prop = props.get("Nom", {}).get("title", [])
-
-        if not title_prop:
+    for film in fetch_notion_films():
+        total += 1
+        title = film.title
+        if not title:
             continue
 
-        title = title_prop[0]["plain_text"]
-
-        match = find_match(title, nas_movies)
+        match = matcher.match(title)
 
         if not match:
             print(f"❌ {title} absent du NAS")
@@ -130,10 +108,29 @@ def sync_nas_to_notion():
         found += 1
 
     print("\n=====================")
+    print(f"📄 Pages Notion parcourues   : {total}")
     print(f"🎬 Films trouvés sur le NAS : {found}")
     print(f"📭 Films absents du NAS     : {missing}")
     print("✅ Sync NAS → Notion terminée (lecture seule)")
 
+# =====================
+# NAS WATCHER (ÉVÉNEMENTS)
+# =====================
+
+def log_nas_event(event: dict):
+    """Abonné services.nas_watcher.NasWatcher : journalise les changements"""
+    movie = event["movie"]
+    linux_path, _ = build_paths(movie["path"])
+
+    if event["type"] == "added":
+        print(f"🆕 Nouveau fichier NAS : {movie['filename']}")
+        print(f"   NAS → {linux_path}")
+    elif event["type"] == "removed":
+        print(f"🗑️ Fichier retiré du NAS : {movie['filename']}")
+    else:
+        print(f"↪️ Fichier déplacé : {event['previous']['filename']} → {movie['filename']}")
+        print(f"   NAS → {linux_path}")
+
 # =====================
 # CLI ENTRY POINT
 # =====================
@@ -5,6 +5,9 @@ from fastapi import FastAPI, HTTPException
 from notion_client import Client
 from dotenv import load_dotenv
 
+from core.film import FilmRecord
+from utils.rate_limit import governor
+
 # =====================
 # ENV
 # =====================
@@ -26,18 +29,8 @@ app = FastAPI(title="Film NAS Server")
 
 def get_nas_path(movie_id: str) -> str | None:
     """Récupère le NAS Path depuis Notion"""
-    page = notion.pages.retrieve(page_id=movie_id)
-    props = page["properties"]
-
-    nas_prop = props.get("NAS Path")
-    if not nas_prop or nas_prop["type"] != "rich_text":
-        return None
-
-    rich = nas_prop["rich_text"]
-    if not rich:
-        return None
-
-    return rich[0]["plain_text"]
+    page = governor("notion").call(notion.pages.retrieve, page_id=movie_id)
+    return FilmRecord.from_page(page).nas_path
 
 
 def open_file(path: str):
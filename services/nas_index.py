@@ -0,0 +1,198 @@
+import json
+import os
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from services.nas_scanner import (
+    SCAN_WORKERS,
+    list_directory,
+    movie_record,
+    walk_parallel,
+)
+from utils.paths import cache_path
+
+
+@dataclass
+class NasDelta:
+    """Changements depuis le dernier scan (enregistrements films)"""
+    added: list[dict] = field(default_factory=list)
+    removed: list[dict] = field(default_factory=list)
+    renamed: list[tuple[dict, dict]] = field(default_factory=list)   # (avant, après)
+    dirs_checked: int = 0
+    dirs_listed: int = 0
+    dirs_unreadable: int = 0
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.renamed)
+
+
+def _diff(old: dict, new: dict) -> NasDelta:
+    """old / new : {chemin: (taille, mtime)}"""
+    delta = NasDelta()
+    gone = [path for path in old if path not in new]
+    fresh = [path for path in new if path not in old]
+
+    # Renommage / déplacement : même taille et même mtime, sans ambiguïté
+    by_stat = defaultdict(list)
+    for path in fresh:
+        by_stat[tuple(new[path])].append(path)
+
+    for path in gone:
+        candidates = by_stat.get(tuple(old[path]), [])
+        if len(candidates) == 1:
+            target = candidates.pop()
+            delta.renamed.append((
+                movie_record(path, size=old[path][0], mtime=old[path][1]),
+                movie_record(target, size=new[target][0], mtime=new[target][1])
+            ))
+        else:
+            delta.removed.append(
+                movie_record(path, size=old[path][0], mtime=old[path][1])
+            )
+
+    moved_to = {after["path"] for _, after in delta.renamed}
+    delta.added = [
+        movie_record(path, size=new[path][0], mtime=new[path][1])
+        for path in fresh
+        if path not in moved_to
+    ]
+    return delta
+
+
+class NasIndex:
+    """
+    Index persistant (JSON) d'une arborescence NAS :
+    {dossier: {"mtime", "files": {nom: [taille, mtime]}, "subdirs"}}
+    Le mtime d'un dossier vient du listing de son parent : un rescan
+    ne liste que les dossiers modifiés et ceux qui ont des sous-dossiers
+    (pour lire leurs mtimes) ; les dossiers feuilles inchangés
+    (un dossier par film) ne coûtent rien.
+    """
+
+    def __init__(
+        self,
+        base_path: str,
+        path: str | None = None,
+        *,
+        workers: int = SCAN_WORKERS
+    ):
+        self.base_path = base_path
+        self.path = path or cache_path("nas_index.json")
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._dirs = {}
+
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("base_path") == base_path:
+                self._dirs = state.get("dirs", {})
+
+    def _save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"base_path": self.base_path, "dirs": self._dirs},
+                f,
+                ensure_ascii=False
+            )
+        os.replace(tmp_path, self.path)
+
+    # =========================
+    # Scan incrémental
+    # =========================
+
+    def _files(self, dirs: dict) -> dict:
+        return {
+            os.path.join(directory, name): stat
+            for directory, entry in dirs.items()
+            for name, stat in entry["files"].items()
+        }
+
+    def refresh(self) -> NasDelta:
+        """Met l'index à jour et retourne les changements"""
+        with self._lock:
+            old_dirs = self._dirs
+            new_dirs = {}
+            checked = listed = unreadable = 0
+
+            def visit(directory: str, mtime: float | None):
+                """Listing d'un dossier ; feuilles inchangées gardées sans appel"""
+                try:
+                    movies, subdirs = list_directory(
+                        directory, with_stat=True, raise_errors=True
+                    )
+                except OSError:
+                    return (None, {}), []
+
+                entry = {
+                    "mtime": mtime,
+                    "files": {
+                        movie["filename"]: [movie["size"], movie["mtime"]]
+                        for movie in movies
+                    },
+                    "subdirs": list(subdirs),
+                }
+
+                kept, children = {}, []
+                for subdir, sub_mtime in subdirs.items():
+                    known = old_dirs.get(subdir)
+                    # Feuille inchangée (mtime lu chez le parent) : aucun appel
+                    if (
+                        known is not None
+                        and known["mtime"] == sub_mtime
+                        and not known["subdirs"]
+                    ):
+                        kept[subdir] = known
+                    else:
+                        children.append((subdir, sub_mtime))
+
+                return (entry, kept), children
+
+            try:
+                base_mtime = os.stat(self.base_path).st_mtime
+            except OSError:
+                base_mtime = None
+
+            for directory, (entry, kept) in walk_parallel(
+                self.base_path,
+                visit,
+                workers=self.workers,
+                arg=base_mtime
+            ):
+                checked += 1 + len(kept)
+
+                if entry is None:
+                    # Partage injoignable / dossier illisible : sous-arbre connu
+                    # conservé ; une suppression n'est vue que dans le listing
+                    # réussi du parent
+                    unreadable += 1
+                    prefix = os.path.join(directory, "")
+                    new_dirs.update(
+                        (path, known) for path, known in old_dirs.items()
+                        if path == directory or path.startswith(prefix)
+                    )
+                    continue
+
+                listed += 1
+                new_dirs[directory] = entry
+                new_dirs.update(kept)
+
+            delta = _diff(self._files(old_dirs), self._files(new_dirs))
+            delta.dirs_checked = checked
+            delta.dirs_listed = listed
+            delta.dirs_unreadable = unreadable
+
+            self._dirs = new_dirs
+            self._save()
+            return delta
+
+    def movies(self) -> list[dict]:
+        """Films indexés (mêmes enregistrements que scan_nas_movies + size / mtime)"""
+        with self._lock:
+            files = self._files(self._dirs)
+        return [
+            movie_record(path, size=stat[0], mtime=stat[1])
+            for path, stat in sorted(files.items())
+        ]
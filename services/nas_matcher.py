@@ -0,0 +1,138 @@
+import math
+import os
+from collections import Counter, defaultdict
+
+from services.nas_scanner import normalize_title, extract_year
+from utils.similarity import ratio, ratio_at_least
+
+# Taille des n-grammes de caractères de l'index inversé
+NGRAM = 3
+
+# Similarité minimale d'un candidat flou (hors sous-chaîne)
+FUZZY_MIN = 0.9
+
+# Part minimale de n-grammes communs pour évaluer un candidat flou
+NGRAM_MIN_SHARE = 0.6
+
+
+def _ngrams(text: str) -> set[str]:
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+def _stem_key(movie: dict) -> str:
+    """Titre normalisé du nom de fichier, sans l'extension"""
+    return normalize_title(os.path.splitext(movie["filename"])[0])
+
+
+class NasMatcher:
+    """
+    Index des films NAS, construit une fois :
+    - titre normalisé exact → {année: films}
+    - n-grammes de caractères → films (sous-chaînes et titres proches)
+    match() retourne le meilleur film, pas le premier trouvé.
+    """
+
+    def __init__(self, movies: list[dict]):
+        self.movies = movies
+        self.keys = [_stem_key(movie) for movie in movies]
+        self.grams = [frozenset(_ngrams(key)) for key in self.keys]
+        self.exact = defaultdict(lambda: defaultdict(list))
+        self.postings = defaultdict(set)
+        self.by_length = defaultdict(set)
+
+        for i, (movie, key) in enumerate(zip(movies, self.keys)):
+            if not key:
+                continue
+            self.exact[key][movie["year"]].append(i)
+            self.by_length[len(key)].add(i)
+            for gram in self.grams[i]:
+                self.postings[gram].add(i)
+
+    # =========================
+    # Candidats
+    # =========================
+
+    def _year_ok(self, i: int, year: str | None) -> bool:
+        # Comme l'ancien matching : année du titre Notion obligatoire si présente
+        return not year or self.movies[i]["year"] == year
+
+    def _substring_candidates(self, norm: str, grams: list[str]) -> set[int]:
+        """Films dont le titre contient norm : intersection des n-grammes"""
+        if not grams:
+            # Titre trop court pour l'index : simple recherche de sous-chaîne
+            return {i for i, key in enumerate(self.keys) if norm in key}
+
+        ids = self.postings.get(grams[0], set())
+        for gram in grams[1:]:
+            if not ids:
+                break
+            ids = ids & self.postings.get(gram, set())
+        return {i for i in ids if norm in self.keys[i]}
+
+    def _fuzzy_candidates(self, norm: str, grams: list[str]) -> set[int]:
+        """
+        Titres proches : un candidat partageant NGRAM_MIN_SHARE des n-grammes
+        contient forcément l'un des plus rares (filtrage par préfixe).
+        """
+        needed = max(1, int(len(grams) * NGRAM_MIN_SHARE))
+        ids = set()
+        for gram in grams[:len(grams) - needed + 1]:
+            ids |= self.postings.get(gram, set())
+
+        # ratio >= FUZZY_MIN impose min / max des longueurs >= FUZZY_MIN / (2 - FUZZY_MIN)
+        span = FUZZY_MIN / (2 - FUZZY_MIN)
+        sized = set()
+        for length in range(math.ceil(len(norm) * span), int(len(norm) / span) + 1):
+            sized |= self.by_length.get(length, set())
+        ids &= sized
+
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, set()) & ids)
+
+        return {
+            i for i, count in shared.items()
+            if count >= needed and ratio_at_least(norm, self.keys[i], FUZZY_MIN)
+        }
+
+    def candidates(self, title: str, limit: int = 5) -> list[tuple[dict, float]]:
+        """Films classés [(film, score)] ; 2 = exact, 1 + ratio = sous-chaîne"""
+        norm = normalize_title(title)
+        if not norm:
+            return []
+        year = extract_year(title)
+
+        buckets = self.exact.get(norm)
+        if buckets:
+            exact = buckets.get(year, []) if year else [
+                i for ids in buckets.values() for i in ids
+            ]
+            if exact:
+                return [(self.movies[i], 2.0) for i in exact[:limit]]
+
+        # N-grammes du plus rare au plus fréquent
+        grams = sorted(
+            _ngrams(norm),
+            key=lambda gram: len(self.postings.get(gram, ()))
+        )
+
+        bonus = 1.0
+        ids = {
+            i for i in self._substring_candidates(norm, grams)
+            if self._year_ok(i, year)
+        }
+        if not ids and grams:
+            bonus = 0.0
+            ids = {
+                i for i in self._fuzzy_candidates(norm, grams)
+                if self._year_ok(i, year)
+            }
+
+        scored = [(bonus + ratio(norm, self.keys[i]), i) for i in ids]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [(self.movies[i], score) for score, i in scored[:limit]]
+
+    def match(self, title: str) -> dict | None:
+        """Meilleur film NAS pour un titre Notion, ou None"""
+        ranked = self.candidates(title, limit=1)
+        return ranked[0][0] if ranked else None
@@ -1,6 +1,7 @@
 import os
 import re
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 VIDEO_EXTS = (".mkv", ".mp4", ".avi", ".mov")
 
@@ -25,7 +26,139 @@ def extract_year(text: str) -> str | None:
 # =========================
 # Scan NAS
 # =========================
-def scan_nas_movies(base_path: str) -> list[dict]:
+
+# Listings de dossiers simultanés (chaque listing SMB = un aller-retour réseau)
+SCAN_WORKERS = 8
+
+
+def movie_record(
+    path: str,
+    *,
+    size: int | None = None,
+    mtime: float | None = None
+) -> dict:
+    """Enregistrement film d'un chemin (size / mtime si connus)"""
+    filename = os.path.basename(path)
+    record = {
+        "path": path,
+        "filename": filename,
+        "normalized": normalize_title(filename),
+        "year": extract_year(filename),
+    }
+    if size is not None:
+        record["size"] = size
+        record["mtime"] = mtime
+    return record
+
+
+def list_directory(
+    path: str,
+    with_stat: bool = False,
+    *,
+    raise_errors: bool = False
+) -> tuple[list[dict], dict[str, float | None]]:
+    """
+    Un listing : (films, {sous-dossier à parcourir: mtime}), ordre de scandir.
+    mtime des sous-dossiers lu seulement si with_stat (sinon None).
+    Dossier illisible : listing vide, ou OSError si raise_errors.
+    """
+    movies, subdirs = [], {}
+
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        # Comme os.walk : pas de descente dans les liens symboliques
+                        if not entry.is_symlink():
+                            subdirs[entry.path] = (
+                                # Sous Windows, stat() réutilise les données du listing
+                                entry.stat().st_mtime if with_stat else None
+                            )
+                    elif entry.name.lower().endswith(VIDEO_EXTS):
+                        if with_stat:
+                            st = entry.stat()
+                            movies.append(movie_record(
+                                entry.path, size=st.st_size, mtime=st.st_mtime
+                            ))
+                        else:
+                            movies.append(movie_record(entry.path))
+                except OSError:
+                    # Entrée illisible : seule celle-ci est ignorée
+                    continue
+    except OSError:
+        if raise_errors:
+            raise
+        # Dossier illisible : ignoré, comme os.walk
+
+    return movies, subdirs
+
+
+def walk_parallel(base_path: str, visit, *, workers: int = SCAN_WORKERS, arg=None):
+    """
+    Parcours parallèle (pool borné) d'une arborescence :
+    visit(dossier, arg) → (résultat, [(sous-dossier, arg), ...]),
+    exécuté dans le pool ; rend (dossier, résultat) au fil des listings.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        running = {pool.submit(visit, base_path, arg): base_path}
+
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                path = running.pop(future)
+                result, children = future.result()
+
+                for child, child_arg in children:
+                    running[pool.submit(visit, child, child_arg)] = child
+
+                yield path, result
+
+
+def iter_nas_movies(
+    base_path: str,
+    *,
+    workers: int = SCAN_WORKERS,
+    ordered: bool = True,
+    with_stat: bool = False
+):
+    """
+    Parcours parallèle (os.scandir, pool borné) des dossiers du NAS.
+    ordered=True  : même ordre qu'os.walk, films rendus en fin de parcours
+    ordered=False : films rendus dès que leur dossier est listé
+    with_stat=True : ajoute "size" et "mtime" à chaque film
+    """
+    def visit(path, _):
+        movies, subdirs = list_directory(path, with_stat)
+        return (movies, list(subdirs)), [(subdir, None) for subdir in subdirs]
+
+    listings = {}
+
+    for path, (movies, subdirs) in walk_parallel(base_path, visit, workers=workers):
+        if ordered:
+            listings[path] = subdirs, movies
+        else:
+            yield from movies
+
+    if not ordered:
+        return
+
+    # Ordre os.walk (top-down) : fichiers du dossier, puis chaque sous-dossier
+    stack = [base_path]
+    while stack:
+        subdirs, movies = listings.pop(stack.pop())
+        yield from movies
+        stack.extend(reversed(subdirs))
+
+
+def scan_nas_movies(
+    base_path: str,
+    *,
+    workers: int = SCAN_WORKERS,
+    ordered: bool = True,
+    with_stat: bool = False
+) -> list[dict]:
     """
     Retourne une liste de films présents sur le NAS :
     [
@@ -37,18 +170,9 @@ def scan_nas_movies(base_path: str) -> list[dict]:
         }
     ]
     """
-    movies = []
-
-    for root, _, files in os.walk(base_path):
-        for f in files:
-            if f.lower().endswith(VIDEO_EXTS):
-                full_path = os.path.join(root, f)
-
-                movies.append({
-                    "path": full_path,
-                    "filename": f,
-                    "normalized": normalize_title(f),
-                    "year": extract_year(f),
-                })
-
-    return movies
+    return list(iter_nas_movies(
+        base_path,
+        workers=workers,
+        ordered=ordered,
+        with_stat=with_stat
+    ))
@@ -0,0 +1,169 @@
+import threading
+import traceback
+
+from services.nas_index import NasDelta, NasIndex
+from services.nas_scanner import VIDEO_EXTS
+
+try:
+    # Notifications natives (inotify, ReadDirectoryChangesW…), si installé
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+# Rescan périodique (seul mécanisme sans watchdog, filet de sécurité sinon)
+POLL_INTERVAL = 60.0
+
+# Regroupe les notifications d'une même copie avant de rescanner
+SETTLE_DELAY = 2.0
+
+
+class _DirtyHandler(FileSystemEventHandler):
+    """Notification native → marque l'index à rafraîchir"""
+
+    def __init__(self, dirty: threading.Event):
+        self.dirty = dirty
+
+    def on_any_event(self, event):
+        paths = (event.src_path, getattr(event, "dest_path", "") or "")
+        if event.is_directory or any(
+            str(path).lower().endswith(VIDEO_EXTS) for path in paths
+        ):
+            self.dirty.set()
+
+
+def delta_events(delta: NasDelta) -> list[dict]:
+    """
+    Événements publiés :
+    {"type": "added" | "removed", "movie"}
+    {"type": "moved", "movie", "previous"}
+    """
+    return (
+        [{"type": "added", "movie": movie} for movie in delta.added]
+        + [{"type": "removed", "movie": movie} for movie in delta.removed]
+        + [
+            {"type": "moved", "movie": after, "previous": before}
+            for before, after in delta.renamed
+        ]
+    )
+
+
+class NasWatcher:
+    """
+    Surveillance continue du NAS :
+    - watchdog installé : notifications natives, puis rescan incrémental
+    - sinon (ou en plus, toutes les POLL_INTERVAL s) : rescan des mtimes
+      de dossiers via NasIndex, efficace sur un partage SMB
+    Les changements sont publiés aux abonnés (subscribe).
+    """
+
+    def __init__(
+        self,
+        base_path: str,
+        index: NasIndex | None = None,
+        *,
+        interval: float = POLL_INTERVAL,
+        native: bool = True
+    ):
+        self.base_path = base_path
+        self.index = index or NasIndex(base_path)
+        self.interval = interval
+        self.native = native and Observer is not None
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._observer = None
+
+    # =========================
+    # Abonnements
+    # =========================
+
+    def subscribe(self, callback):
+        """callback(event) ; retourne la fonction de désabonnement"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def _publish(self, events: list[dict]):
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for event in events:
+            for callback in subscribers:
+                try:
+                    callback(event)
+                except Exception:
+                    # Un abonné en erreur ne doit pas arrêter la surveillance
+                    traceback.print_exc()
+
+    # =========================
+    # Boucle
+    # =========================
+
+    def refresh(self) -> NasDelta:
+        """Rescan incrémental immédiat, changements publiés"""
+        delta = self.index.refresh()
+        if delta:
+            self._publish(delta_events(delta))
+        return delta
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._dirty.wait(self.interval):
+                # Laisse se terminer la copie en cours avant de rescanner
+                self._stop.wait(SETTLE_DELAY)
+            if self._stop.is_set():
+                return
+
+            self._dirty.clear()
+            try:
+                self.refresh()
+            except Exception:
+                traceback.print_exc()
+
+    def start(self):
+        if self._thread:
+            return
+
+        if self.native:
+            try:
+                self._observer = Observer()
+                self._observer.schedule(
+                    _DirtyHandler(self._dirty),
+                    self.base_path,
+                    recursive=True
+                )
+                self._observer.start()
+            except Exception:
+                # Montage non supporté (ex. inotify sur SMB) : polling seul
+                self._observer = None
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="nas-watcher",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._dirty.set()
+
+        if self._observer:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+        if self._thread:
+            self._thread.join()
+            self._thread = None
@@ -8,10 +8,13 @@ def ask_choice(
     parent,
     title: str = "Sélection TMDB",
     width: int = 720,
-    height: int = 420
+    height: int = 420,
+    updates: dict | None = None
 ) -> int:
     """
     Affiche une fenêtre de sélection.
+    updates : {index (1-based): Future[str]} — texte définitif d'une option,
+              affiché dès qu'il est prêt (la fenêtre s'ouvre sans attendre)
     Retour :
       - index (1-based) si choix
       - 0 si annulé
@@ -77,34 +80,73 @@ def ask_choice(
     # ==================================================
 
     selected = tk.IntVar(value=1)
+    widgets = {}
+
+    def split(text):
+        lines = text.split("\n")
+        return lines[0], "\n".join(lines[1:])
 
     for i, text in enumerate(options, start=1):
         container = ctk.CTkFrame(content, fg_color="transparent")
         container.pack(fill="x", padx=6, pady=10)
 
-        lines = text.split("\n")
-        title_line = lines[0]
-        details = "\n".join(lines[1:])
+        title_line, details = split(text)
+        prefix = "👉 " if i == 1 else "   "
 
-        ctk.CTkRadioButton(
+        radio = ctk.CTkRadioButton(
             container,
-            text=("👉 " if i == 1 else "   ") + title_line,
+            text=prefix + title_line,
             variable=selected,
             value=i,
             font=("Segoe UI", 14, "bold"),
             fg_color="#444",
             text_color="#FFFFFF"
-        ).pack(anchor="w")
+        )
+        radio.pack(anchor="w")
 
-        if details.strip():
-            ctk.CTkLabel(
+        label = None
+        if details.strip() or (updates and i in updates):
+            label = ctk.CTkLabel(
                 container,
                 text=details,
                 font=("Segoe UI", 13),
                 text_color="#CCCCCC",
                 wraplength=580,
                 justify="left"
-            ).pack(anchor="w", padx=(28, 0), pady=(4, 0))
+            )
+            label.pack(anchor="w", padx=(28, 0), pady=(4, 0))
+
+        widgets[i] = (prefix, radio, label)
+
+    # ==================================================
+    # Détails reçus en arrière-plan
+    # ==================================================
+
+    pending = dict(updates or {})
+
+    def poll():
+        if not win.winfo_exists():
+            return
+
+        for i, future in list(pending.items()):
+            if not future.done():
+                continue
+            del pending[i]
+
+            if future.cancelled() or future.exception():
+                continue
+
+            title_line, details = split(future.result())
+            prefix, radio, label = widgets[i]
+            radio.configure(text=prefix + title_line)
+            if label:
+                label.configure(text=details)
+
+        if pending:
+            win.after(50, poll)
+
+    if pending:
+        win.after(0, poll)
 
     # ==================================================
     # Boutons d'action
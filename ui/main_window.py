@@ -1,26 +1,30 @@
 import customtkinter as ctk
 import tkinter as tk
-from datetime import datetime
-import re
-import unicodedata
-from difflib import SequenceMatcher
+from concurrent.futures import ThreadPoolExecutor
 
 # === CORE ===
 from core.notion import (
-    fetch_all_pages,
-    get_movies_to_enrich,
+    iter_pages,
+    tmdb_pending_filter,
+    get_future_releases,
     get_title,
     get_release_date,
-    update_movie_page,
-    add_poster_and_backdrop,
-    compute_tags_from_categories,
+    block_cache,
 )
 from core.calendar import sync_future_releases
-from core.tmdb import search_movie, score_movie
+from core.enrichment import EnrichmentPipeline
+from core.film import FilmRecord
+from core.review_queue import ReviewQueue
+from core.prefetch import LookAhead
+from core.tmdb import (
+    find_candidates,
+    get_director,
+    get_movie_details,
+    reset_details_memo,
+)
 from core.tmdb_utils import (
     extract_tmdb_id_from_url,
     extract_imdb_id_from_url,
-    get_movie_by_tmdb_id,
     get_tmdb_movie_from_imdb_id,
 )
 
@@ -28,109 +32,58 @@ from core.tmdb_utils import (
 from ui.chooser import ask_choice
 
 # === UTILS ===
-from utils.text import clean_search_title, extract_year
-from utils.request import safe_get_json
-from config import TMDB_API_KEY
-
-
-# ==================================================
-# Helpers TMDB — LOGIQUE MÉTIER
-# ==================================================
-
-def normalize_title(title: str) -> str:
-    title = unicodedata.normalize("NFKD", title)
-    title = "".join(c for c in title if not unicodedata.combining(c))
-    title = title.lower()
-    title = re.sub(r"[^a-z0-9 ]", "", title)
-    title = re.sub(r"\s+", " ", title).strip()
-    return title
-
-
-def title_matches(notion_title: str, tmdb_title: str) -> bool:
-    return (
-        SequenceMatcher(
-            None,
-            normalize_title(notion_title),
-            normalize_title(tmdb_title)
-        ).ratio() >= 0.85
-    )
-
+from utils.request import cache_stats
 
-def is_released_tmdb(movie: dict) -> bool:
-    date_str = movie.get("release_date")
-    if not date_str:
-        return False
-    try:
-        release_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-    except ValueError:
-        return False
-    return release_date <= datetime.now().date()
+# Nombre de titres préparés (recherche TMDB) à l'avance
+PREFETCH_WINDOW = 3
 
+# Cas ambigus laissés par scripts/enrich_headless.py
+review_queue = ReviewQueue()
 
-def get_director(movie_id: int) -> str:
-    url = (
-        f"https://api.themoviedb.org/3/movie/{movie_id}/credits"
-        f"?api_key={TMDB_API_KEY}&language=fr-FR"
-    )
-    data = safe_get_json(url)
-    for crew in data.get("crew", []):
-        if crew.get("job") == "Director":
-            return crew.get("name", "")
-    return ""
 
+# ==================================================
+# Helpers — AFFICHAGE
+# ==================================================
 
-def get_movie_genres(movie_id: int) -> list[str]:
-    url = (
-        f"https://api.themoviedb.org/3/movie/{movie_id}"
-        f"?api_key={TMDB_API_KEY}&language=fr-FR"
-    )
-    data = safe_get_json(url)
-    return [g["name"] for g in data.get("genres", [])]
+def format_candidate(movie: dict, director: str | None = None) -> str:
+    """Texte d'une option du choix manuel (director=None : en chargement)"""
+    year = (movie.get("release_date") or "")[:4] or "?"
+    rating = movie.get("vote_average", 0)
+    votes = movie.get("vote_count", 0)
 
+    overview = (movie.get("overview") or "").strip()
+    if len(overview) > 240:
+        overview = overview[:237].rsplit(" ", 1)[0] + "…"
 
-def get_movie_poster_url(movie: dict) -> str | None:
-    return (
-        f"https://image.tmdb.org/t/p/w500{movie['poster_path']}"
-        if movie.get("poster_path") else None
-    )
+    if director is None:
+        director_line = "🎬 Réalisateur…"
+    else:
+        director_line = f"🎬 {director or 'Réalisateur inconnu'}"
 
-
-def get_movie_backdrop_url(movie: dict) -> str | None:
     return (
-        f"https://image.tmdb.org/t/p/w780{movie['backdrop_path']}"
-        if movie.get("backdrop_path") else None
+        f"{movie.get('title')} ({year})\n"
+        f"{director_line}\n"
+        f"⭐ {rating}/10 · {votes} votes\n\n"
+        f"{overview}"
     )
 
 
-def auto_pick_movie(results: list[dict], title: str) -> dict | None:
-    if len(results) == 1:
-        return results[0]
-
-    scored = [(m, score_movie(m, title)) for m in results]
-    scored.sort(key=lambda x: x[1], reverse=True)
-
-    best, best_score = scored[0]
-    second_score = scored[1][1] if len(scored) > 1 else 0
-
-    if best_score >= 0.85 and (best_score - second_score) >= 0.20:
-        return best
-
-    if best_score >= 0.75 and best.get("vote_count", 0) >= 2000:
-        return best
-
-    return None
-
-
 # ==================================================
 # Fenêtre principale
 # ==================================================
 
 class MovieUpdaterWindow(ctk.CTk):
 
-    def __init__(self, auto_mode=False):
+    def __init__(self, auto_mode=False, prefetch_window=PREFETCH_WINDOW):
         super().__init__()
 
         self.auto_mode = auto_mode
+        self.prefetch_window = prefetch_window
+        # Détails TMDB des candidats (choix manuel)
+        self._details_pool = ThreadPoolExecutor(
+            max_workers=10,
+            thread_name_prefix="tmdb-details"
+        )
         self.geometry("1000x720")
         self.resizable(True, True)
         self.configure(bg="#181A20")
@@ -177,6 +130,16 @@ class MovieUpdaterWindow(ctk.CTk):
             width=340,
             height=44,
             font=("Segoe UI Bold", 16)
+        ).pack(pady=(0, 8))
+
+        ctk.CTkButton(
+            self.main_card,
+            text="📋 File de revue",
+            command=self.run_review,
+            width=340,
+            height=36,
+            font=("Segoe UI", 14),
+            fg_color="#444"
         ).pack(pady=(0, 18))
 
         self.progress = ctk.CTkProgressBar(self.main_card)
@@ -225,183 +188,235 @@ class MovieUpdaterWindow(ctk.CTk):
 
     # ================= WORKFLOW =================
 
-    def run_update(self):
+    def _report_enrichment(self, results):
+        for label, error in results:
+            if error:
+                self.log(f"❌ {label} : {error}", "error")
+            else:
+                self.log(f"✅ {label} enrichi", "success")
+
+    def _finish_pipeline(self, pipeline):
+        """Attend les derniers enrichissements sans figer la fenêtre"""
+        while pipeline.pending():
+            self._report_enrichment(pipeline.wait(0.1))
+            self.update()
+        self._report_enrichment(pipeline.join())
+        if pipeline.saved_calls:
+            self.log(f"♻️ Appels Notion évités : {pipeline.saved_calls}")
+
+    def _manual_pick(self, results: list[dict]) -> dict | None:
+        """
+        Choix manuel parmi les candidats, sinon URL TMDB / IMDb.
+        None : film ignoré ou introuvable.
+        """
+        force_url = False
+
+        if results:
+            # Réalisateurs chargés en parallèle,
+            # la fenêtre s'ouvre tout de suite
+            options = [format_candidate(m) for m in results]
+            updates = {
+                i: self._details_pool.submit(
+                    lambda m=m: format_candidate(m, get_director(m["id"]))
+                )
+                for i, m in enumerate(results, start=1)
+            }
+
+            choice = ask_choice(options=options, parent=self, updates=updates)
+
+            if choice == -1:
+                self.log("🔗 Saisie manuelle via URL demandée", "info")
+                force_url = True
+
+            elif choice == 0:
+                self.log("⏭️ Ignoré", "info")
+                return None
+
+            else:
+                return results[choice - 1]
+
+        # ===============================
+        # FALLBACK URL
+        # ===============================
+        if not force_url:
+            self.log("❌ Aucun résultat valide → URL requise", "warn")
+
+        url = self.ask_manual_url()
+        if not url:
+            self.log("⏭️ Ignoré (pas d’URL)", "info")
+            return None
+
+        tmdb_id = extract_tmdb_id_from_url(url)
+        imdb_id = extract_imdb_id_from_url(url)
+
+        if tmdb_id:
+            self.log(f"🔗 Import TMDB ID : {tmdb_id}")
+            movie = get_movie_details(tmdb_id)
+
+        elif imdb_id:
+            self.log(f"🔗 Import IMDb ID : {imdb_id}")
+            movie = get_tmdb_movie_from_imdb_id(imdb_id)
+
+        else:
+            self.log("❌ URL non reconnue", "error")
+            return None
+
+        if not movie:
+            self.log("❌ Impossible de récupérer le film", "error")
+        return movie
+
+    def run_review(self):
+        """Films ambigus laissés par le mode sans interface"""
+        pipeline = None
         try:
-            # --- Reset logs ---
             self.log_box.config(state="normal")
             self.log_box.delete(1.0, tk.END)
             self.log_box.config(state="disabled")
+            block_cache.clear()
 
-            pages = fetch_all_pages()
-            pages_to_enrich = get_movies_to_enrich(pages)
+            items = review_queue.items()
+            self.log(f"📋 File de revue : {len(items)} film(s)")
+            pipeline = EnrichmentPipeline()
 
-            self.log(f"🎯 Films à enrichir : {len(pages_to_enrich)}")
-            total = max(len(pages_to_enrich), 1)
-            self.progress.set(0)
+            for idx, item in enumerate(items, start=1):
+                self._report_enrichment(pipeline.drain())
+                self.progress.set((idx - 1) / max(len(items), 1))
 
-            for idx, page in enumerate(pages_to_enrich, start=1):
-                title = get_title(page)
-                if not title:
-                    continue
+                title = item["title"]
+                self.log(f"🔍 {title} ({item['reason']})")
 
-                self.log(f"🔍 Recherche TMDB : {title}")
+                movie = self._manual_pick(item["candidates"])
+                if not movie:
+                    continue
 
-                results = search_movie(
-                    clean_search_title(title),
-                    extract_year(title)
+                review_queue.discard(item["page_id"])
+                pipeline.submit(
+                    FilmRecord(id=item["page_id"], title=title),
+                    movie,
+                    label=title
                 )
 
-                movie = None
-                force_url = False
-
-                # ===============================
-                # A — Recherche TMDB
-                # ===============================
-                if results:
-                    results = sorted(
-                        results,
-                        key=lambda m: score_movie(m, title),
-                        reverse=True
-                    )[:10]
-
-                    candidate = auto_pick_movie(results, title)
-
-                    if (
-                            candidate
-                            and is_released_tmdb(candidate)
-                            and title_matches(title, candidate.get("title", ""))
-                    ):
-                        movie = candidate
-                        self.log("🎯 Auto-pick validé (titre + date OK)", "info")
-
-                    else:
-                        self.log(
-                            "🛑 Auto-pick bloqué → choix manuel requis",
-                            "info"
-                        )
-
-                    # ===============================
-                    # B — Choix manuel
-                    # ===============================
-                    if not movie:
-                        options = []
+            self._finish_pipeline(pipeline)
+            self.progress.set(1)
+            self.log(
+                f"🎉 Revue terminée ({len(review_queue)} restant(s))",
+                "success"
+            )
 
-                        for m in results:
-                            year = (m.get("release_date") or "")[:4] or "?"
-                            rating = m.get("vote_average", 0)
-                            votes = m.get("vote_count", 0)
+        except Exception as e:
+            if pipeline:
+                pipeline.shutdown()
+            self.log(f"❌ Erreur : {e}", "error")
 
-                            overview = (m.get("overview") or "").strip()
-                            if len(overview) > 240:
-                                overview = overview[:237].rsplit(" ", 1)[0] + "…"
+    def run_update(self):
+        pipeline = None
+        lookahead = None
+        try:
+            # --- Reset logs ---
+            self.log_box.config(state="normal")
+            self.log_box.delete(1.0, tk.END)
+            self.log_box.config(state="disabled")
+            block_cache.clear()
+            reset_details_memo()
+
+            # Filtre côté Notion : uniquement les films non enrichis,
+            # traités au fil des lots (le lot suivant est lu en parallèle)
+            pages_to_enrich = iter_pages(
+                filter=tmdb_pending_filter(),
+                prefetch=True
+            )
 
-                            director = get_director(m["id"])
+            # Total inconnu en streaming → barre indéterminée
+            self.progress.configure(mode="indeterminate")
+            self.progress.start()
+            idx = 0
 
-                            options.append(
-                                f"{m.get('title')} ({year})\n"
-                                f"🎬 {director or 'Réalisateur inconnu'}\n"
-                                f"⭐ {rating}/10 · {votes} votes\n\n"
-                                f"{overview}"
-                            )
+            # Écritures Notion + détails TMDB en parallèle du choix suivant
+            pipeline = EnrichmentPipeline()
 
-                        choice = ask_choice(options=options, parent=self)
+            # Recherches TMDB des titres suivants préparées en arrière-plan
+            # (pendant les dialogues de choix)
+            lookahead = LookAhead(
+                (page for page in pages_to_enrich if get_title(page)),
+                lambda page: find_candidates(get_title(page)),
+                window=self.prefetch_window
+            )
 
-                        if choice == -1:
-                            self.log("🔗 Saisie manuelle via URL demandée", "info")
-                            force_url = True
+            for idx, (page, prepared) in enumerate(lookahead, start=1):
+                self._report_enrichment(pipeline.drain())
 
-                        elif choice == 0:
-                            self.log("⏭️ Ignoré", "info")
-                            continue
+                title = get_title(page)
+                self.log(f"🔍 Recherche TMDB : {title}")
 
-                        else:
-                            movie = results[choice - 1]
+                decision = prepared.result()
+                results = decision["results"]
 
                 # ===============================
-                # C — FALLBACK URL
+                # A — Recherche TMDB
                 # ===============================
-                if not movie:
-                    if not force_url:
-                        self.log("❌ Aucun résultat valide → URL requise", "warn")
+                movie = decision["pick"]
 
-                    url = self.ask_manual_url()
-                    if not url:
-                        self.log("⏭️ Ignoré (pas d’URL)", "info")
-                        continue
-
-                    tmdb_id = extract_tmdb_id_from_url(url)
-                    imdb_id = extract_imdb_id_from_url(url)
-
-                    if tmdb_id:
-                        self.log(f"🔗 Import TMDB ID : {tmdb_id}")
-                        movie = get_movie_by_tmdb_id(tmdb_id)
+                if movie:
+                    self.log("🎯 Auto-pick validé (titre + date OK)", "info")
 
-                    elif imdb_id:
-                        self.log(f"🔗 Import IMDb ID : {imdb_id}")
-                        movie = get_tmdb_movie_from_imdb_id(imdb_id)
+                elif results:
+                    ranking = decision["ranking"]
+                    self.log(
+                        "🛑 Auto-pick bloqué → choix manuel requis "
+                        f"(score {ranking.scores[0]:.2f}, "
+                        f"écart {ranking.margin:.2f})",
+                        "info"
+                    )
 
-                    else:
-                        self.log("❌ URL non reconnue", "error")
+                # ===============================
+                # B / C — Choix manuel, sinon URL
+                # ===============================
+                if not movie:
+                    movie = self._manual_pick(results)
+                    if not movie:
                         continue
 
-                if not movie:
-                    self.log("❌ Impossible de récupérer le film", "error")
-                    continue
+                review_queue.discard(page.id)
 
                 # ===============================
-                # D — ENRICHISSEMENT NOTION
+                # D — ENRICHISSEMENT NOTION (arrière-plan)
                 # ===============================
-                release = None
-                if movie.get("release_date"):
-                    try:
-                        release = datetime.strptime(
-                            movie["release_date"], "%Y-%m-%d"
-                        )
-                    except ValueError:
-                        pass
-
-                genres = get_movie_genres(movie["id"])
-                tags = compute_tags_from_categories(
-                    genres,
-                    release.year if release else None
-                )
+                pipeline.submit(page, movie, label=title)
+                self.log(f"📤 {title} → enrichissement en cours", "info")
 
-                update_movie_page(
-                    page_id=page["id"],
-                    title=movie["title"],
-                    synopsis=movie.get("overview", ""),
-                    genres=genres,
-                    tags=tags,
-                    director=get_director(movie["id"]),
-                    release_date=release,
-                    support="Cinéma"
-                    if release and release > datetime.now()
-                    else "À télécharger"
-                )
-
-                add_poster_and_backdrop(
-                    page["id"],
-                    get_movie_poster_url(movie),
-                    get_movie_backdrop_url(movie)
-                )
+            # Fin du parcours → on attend les derniers enrichissements
+            self._finish_pipeline(pipeline)
 
-                self.progress.set(idx / total)
-                self.log(f"✅ {title} enrichi", "success")
+            self.progress.stop()
+            self.progress.configure(mode="determinate")
+            self.log(f"🎯 Films parcourus : {idx}")
 
             # ===============================
             # E — CALENDRIER
             # ===============================
             self.log("📅 Synchronisation calendrier…")
             sync_future_releases(
-                pages,
+                get_future_releases(),
                 get_title,
                 get_release_date,
                 log=self.log
             )
 
+            stats = cache_stats()
+            self.log(
+                f"🗄️ Cache TMDB : {stats['hits']} hits · "
+                f"{stats['misses']} misses · {stats['entries']} entrées"
+            )
+
             self.progress.set(1)
             self.log("🎉 Mise à jour terminée", "success")
 
         except Exception as e:
+            if lookahead:
+                lookahead.cancel()
+            if pipeline:
+                pipeline.shutdown()
+            self.progress.stop()
+            self.progress.configure(mode="determinate")
             self.log(f"❌ Erreur : {e}", "error")
 
@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Éléments soumis d'avance par worker
+IN_FLIGHT_PER_WORKER = 2
+
+_END = object()
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{(seconds % 3600) // 60:02d}"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}"
+    return f"{seconds}s"
+
+
+class Checkpoint:
+    """Ids déjà traités, un par ligne (ajout en fin de fichier)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.done = set()
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.done = {line.strip() for line in f if line.strip()}
+
+    def add(self, item_id: str):
+        with self._lock:
+            self.done.add(item_id)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(item_id + "\n")
+
+    def clear(self):
+        with self._lock:
+            self.done.clear()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+def run_bulk_job(
+    items: list,
+    worker,
+    *,
+    key,
+    checkpoint_path: str,
+    workers: int = 4,
+    label: str = "job",
+    log=print,
+    report_every: float = 5.0
+) -> dict:
+    """
+    Traite `items` en parallèle avec reprise sur interruption.
+    - worker(item) : traitement d'un élément (exception = à refaire)
+    - key(item)    : identifiant stable, sauvegardé au checkpoint
+    Le checkpoint est supprimé quand tout est traité sans erreur.
+    Retour : {"done", "skipped", "errors"}
+    """
+    checkpoint = Checkpoint(checkpoint_path)
+    todo = [item for item in items if key(item) not in checkpoint.done]
+    skipped = len(items) - len(todo)
+
+    if skipped:
+        log(f"⏩ {label} : reprise, {skipped} déjà traités")
+
+    total = len(todo)
+    done = 0
+    errors = 0
+    started = time.monotonic()
+    last_report = started
+
+    def run_one(item):
+        worker(item)
+        # Enregistré par le worker : même un élément terminé après
+        # une interruption est sauvegardé
+        checkpoint.add(key(item))
+
+    # Soumission par lots bornés : une interruption n'a que peu à annuler
+    pending = iter(todo)
+    running = {}
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    def fill():
+        while len(running) < workers * IN_FLIGHT_PER_WORKER:
+            item = next(pending, _END)
+            if item is _END:
+                return
+            running[executor.submit(run_one, item)] = item
+
+    try:
+        fill()
+
+        while running:
+            # Timeout : Ctrl-C reste traité pendant l'attente (Windows)
+            finished, _ = wait(running, timeout=0.5, return_when=FIRST_COMPLETED)
+
+            for future in finished:
+                item = running.pop(future)
+                try:
+                    future.result()
+                except Exception as e:
+                    errors += 1
+                    log(f"❌ {label} : {key(item)} → {e}")
+                done += 1
+
+                now = time.monotonic()
+                if now - last_report >= report_every or done == total:
+                    last_report = now
+                    rate = done / max(now - started, 1e-6)
+                    eta = (total - done) / rate if rate else 0
+                    log(
+                        f"📊 {label} : {done}/{total} "
+                        f"· {rate:.1f}/s · ETA {_format_duration(eta)}"
+                    )
+
+            fill()
+
+    except BaseException:
+        # Interruption : les éléments en attente sont abandonnés,
+        # ceux en cours se terminent en arrière-plan
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+
+    executor.shutdown()
+
+    if not errors:
+        checkpoint.clear()
+
+    return {"done": done - errors, "skipped": skipped, "errors": errors}
@@ -0,0 +1,127 @@
+import json
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+# Paramètres jamais inclus dans la clé (secrets)
+_SECRET_PARAMS = {"api_key"}
+
+
+def cache_key(url: str, params: dict | None = None) -> str:
+    """URL normalisée : paramètres triés, clé API retirée"""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query.update({k: str(v) for k, v in (params or {}).items()})
+
+    for secret in _SECRET_PARAMS:
+        query.pop(secret, None)
+
+    path = parts.path.rstrip("/")
+    return f"{parts.netloc}{path}?{urlencode(sorted(query.items()))}"
+
+
+class HttpCache:
+    """
+    Cache disque (SQLite) de réponses JSON :
+    - TTL par entrée
+    - taille bornée, éviction LRU (dernier accès)
+    - compteurs hits / misses
+    """
+
+    def __init__(self, path: str, *, max_entries: int = 20000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+        )
+        conn.commit()
+
+    def _conn(self):
+        # Une connexion par thread (workers d'enrichissement)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str):
+        conn = self._conn()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value, expires FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+
+        if not row or row[1] < now:
+            if row:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                conn.commit()
+            self._count(False)
+            return None
+
+        conn.execute(
+            "UPDATE entries SET accessed = ? WHERE key = ?", (now, key)
+        )
+        conn.commit()
+        self._count(True)
+        return json.loads(row[0])
+
+    def set(self, key: str, value, ttl: float):
+        conn = self._conn()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, value, expires, accessed) "
+            "VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value, ensure_ascii=False), now + ttl, now)
+        )
+        conn.commit()
+
+        with self._lock:
+            self._writes += 1
+            check = self._writes % 100 == 0
+        if check:
+            self.evict()
+
+    def evict(self):
+        """Supprime les entrées expirées puis les moins récemment lues"""
+        conn = self._conn()
+        conn.execute("DELETE FROM entries WHERE expires < ?", (time.time(),))
+
+        (count,) = conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        if count > self.max_entries:
+            # Marge de 10 % pour ne pas évincer à chaque écriture
+            excess = count - int(self.max_entries * 0.9)
+            conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                " SELECT key FROM entries ORDER BY accessed LIMIT ?)",
+                (excess,)
+            )
+        conn.commit()
+
+    def stats(self) -> dict:
+        (count,) = self._conn().execute(
+            "SELECT COUNT(*) FROM entries"
+        ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": count}
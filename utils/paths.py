@@ -0,0 +1,15 @@
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dossier des caches locaux (miroir Notion, index…)
+CACHE_DIR = os.getenv(
+    "FILM_NOTION_CACHE_DIR",
+    os.path.join(PROJECT_ROOT, ".cache")
+)
+
+
+def cache_path(filename: str) -> str:
+    """Chemin d'un fichier de cache (crée le dossier si besoin)"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, filename)
@@ -0,0 +1,184 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+# =========================
+# Token bucket
+# =========================
+
+class TokenBucket:
+    """
+    Seau à jetons thread-safe :
+    `rate` jetons / seconde, au plus `burst` jetons d'avance.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+# =========================
+# Lecture des erreurs HTTP
+# =========================
+
+def _status_of(exc: Exception) -> int | None:
+    """Code HTTP d'une erreur notion_client / requests / googleapiclient"""
+    status = getattr(exc, "status", None)              # notion_client
+    if status is None:
+        response = getattr(exc, "response", None)      # requests
+        status = getattr(response, "status_code", None)
+    if status is None:
+        resp = getattr(exc, "resp", None)              # googleapiclient
+        status = getattr(resp, "status", None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _headers_of(exc: Exception):
+    headers = getattr(exc, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+    if headers is None:
+        headers = getattr(exc, "resp", None)           # httplib2.Response (dict)
+    return headers or {}
+
+
+def _retry_after(exc: Exception) -> float | None:
+    """Retry-After en secondes (valeur numérique ou date HTTP)"""
+    headers = _headers_of(exc)
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+# =========================
+# Gouverneur par service
+# =========================
+
+class RateGovernor:
+    """
+    Point de passage unique des appels sortants d'un service :
+    - débit limité par token bucket
+    - concurrence limitée (max_concurrency appels simultanés)
+    - 429 : attend Retry-After (tous les appelants du service sont suspendus)
+    - 5xx : backoff exponentiel avec jitter
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        *,
+        burst: int | None = None,
+        max_concurrency: int = 4,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0
+    ):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst or max(1, int(rate)))
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _wait_pause(self):
+        while True:
+            with self._lock:
+                remaining = self._paused_until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+    def _pause(self, seconds: float):
+        with self._lock:
+            self._paused_until = max(
+                self._paused_until,
+                time.monotonic() + seconds
+            )
+
+    def call(self, fn, *args, cost: int = 1, **kwargs):
+        """
+        Exécute fn(*args, **kwargs) dans le budget du service.
+        cost : nombre de requêtes comptées (ex. requête batch)
+        """
+        attempt = 0
+
+        while True:
+            self._wait_pause()
+            for _ in range(cost):
+                self.bucket.acquire()
+
+            try:
+                with self._slots:
+                    return fn(*args, **kwargs)
+            except Exception as exc:
+                status = _status_of(exc)
+                retryable = status == 429 or (status is not None and status >= 500)
+
+                if not retryable or attempt >= self.max_retries:
+                    raise
+
+                delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+                delay += random.uniform(0, delay / 2)
+
+                if status == 429:
+                    retry_after = _retry_after(exc)
+                    if retry_after is not None:
+                        delay = retry_after
+                    self._pause(delay)
+                else:
+                    time.sleep(delay)
+
+                attempt += 1
+
+
+# Budgets par service (limites documentées, avec une marge)
+_GOVERNORS = {
+    "notion": RateGovernor("notion", 3, burst=3, max_concurrency=3),
+    "tmdb": RateGovernor("tmdb", 20, burst=20, max_concurrency=8),
+    "calendar": RateGovernor("calendar", 5, burst=5, max_concurrency=4),
+}
+
+
+def governor(service: str) -> RateGovernor:
+    return _GOVERNORS[service]
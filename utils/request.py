@@ -1,13 +1,79 @@
+import re
+
 import requests
 
-def safe_get_json(url: str, timeout=10) -> dict:
+from utils.http_cache import HttpCache, cache_key
+from utils.paths import cache_path
+from utils.rate_limit import governor
+
+DAY = 24 * 3600
+
+# TTL par endpoint TMDB (1ère règle qui correspond)
+_TTL_RULES = [
+    (re.compile(r"/search/"), 1 * DAY),           # résultats de recherche
+    (re.compile(r"/genre/"), 30 * DAY),
+    (re.compile(r"/find/"), 30 * DAY),
+    (re.compile(r"/movie/\d+"), 30 * DAY),        # détails, crédits…
+]
+_DEFAULT_TTL = 1 * DAY
+
+_cache = HttpCache(cache_path("tmdb_cache.sqlite3"))
+
+
+def ttl_for(url: str) -> float:
+    for pattern, ttl in _TTL_RULES:
+        if pattern.search(url):
+            return ttl
+    return _DEFAULT_TTL
+
+
+def cache_stats() -> dict:
+    """{"hits", "misses", "entries"} du cache TMDB"""
+    return _cache.stats()
+
+
+def governed_get(url: str, *, params=None, timeout=10, service="tmdb"):
+    """
+    GET via le gouverneur du service (débit, 429 / Retry-After, 5xx).
+    Retourne la réponse ; les 4xx restent à la charge de l'appelant.
+    """
+    def get():
+        r = requests.get(url, params=params, timeout=timeout)
+        if r.status_code == 429 or r.status_code >= 500:
+            r.raise_for_status()
+        return r
+
+    return governor(service).call(get)
+
+
+def safe_get_json(
+    url: str,
+    timeout=10,
+    *,
+    params: dict | None = None,
+    use_cache: bool = True
+) -> dict:
+    """
+    JSON d'une URL TMDB, via le cache disque.
+    Erreur → {"_error": True, ...} (jamais mis en cache)
+    """
+    key = cache_key(url, params)
+
+    if use_cache:
+        cached = _cache.get(key)
+        if cached is not None:
+            return cached
+
     try:
-        r = requests.get(url, timeout=timeout)
+        r = governed_get(url, params=params, timeout=timeout)
         r.raise_for_status()
-        return r.json()
+        data = r.json()
     except requests.RequestException as e:
         return {
             "_error": True,
             "_message": str(e),
             "_url": url
         }
+
+    _cache.set(key, data, ttl_for(url))
+    return data
@@ -0,0 +1,102 @@
+from functools import lru_cache
+
+try:
+    # Implémentation C, si installée
+    from rapidfuzz.distance import Indel as _Indel
+except ImportError:
+    _Indel = None
+
+
+# =========================
+# LCS bit-parallèle (repli pur Python)
+# =========================
+
+@lru_cache(maxsize=4096)
+def _char_masks(a: str) -> dict[str, int]:
+    """Positions de chaque caractère de a, en bits (réutilisé par requête)"""
+    masks = {}
+    bit = 1
+    for c in a:
+        masks[c] = masks.get(c, 0) | bit
+        bit <<= 1
+    return masks
+
+
+def _lcs_length(a: str, b: str) -> int:
+    """
+    Longueur de la plus longue sous-séquence commune
+    (Hyyrö 2004 : un passage sur b, a encodé en bits)
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return 0
+
+    masks = _char_masks(a)
+    full = (1 << len(a)) - 1
+    s = full
+    for c in b:
+        m = masks.get(c)
+        if m:
+            u = s & m
+            s = ((s + u) | (s - u)) & full
+
+    return len(a) - s.bit_count()
+
+
+# =========================
+# Ratios
+# =========================
+
+@lru_cache(maxsize=65536)
+def ratio(a: str, b: str) -> float:
+    """
+    Similarité Levenshtein normalisée (distance InDel) entre 0 et 1 :
+    2 × LCS / (len(a) + len(b)), même échelle que SequenceMatcher.ratio()
+    """
+    total = len(a) + len(b)
+    if not total:
+        return 1.0
+    if _Indel is not None:
+        return _Indel.normalized_similarity(a, b)
+    return 2 * _lcs_length(a, b) / total
+
+
+def ratio_at_least(a: str, b: str, threshold: float) -> bool:
+    """ratio(a, b) >= threshold, sans calcul si les longueurs l'excluent"""
+    total = len(a) + len(b)
+    if not total:
+        return True
+    # Borne haute : LCS ≤ la plus courte des deux chaînes
+    if 2 * min(len(a), len(b)) / total < threshold:
+        return False
+    return ratio(a, b) >= threshold
+
+
+@lru_cache(maxsize=16384)
+def token_set_ratio(a: str, b: str) -> float:
+    """
+    Comparaison par ensembles de mots (ordre et doublons ignorés),
+    utile pour « Seigneur des anneaux, Le » vs « Le Seigneur des anneaux »
+    """
+    ta, tb = set(a.split()), set(b.split())
+    common = " ".join(sorted(ta & tb))
+    rest_a = " ".join(sorted(ta - tb))
+    rest_b = " ".join(sorted(tb - ta))
+
+    full_a = f"{common} {rest_a}".strip()
+    full_b = f"{common} {rest_b}".strip()
+
+    if common and (not rest_a or not rest_b):
+        return 1.0
+
+    return max(
+        ratio(common, full_a) if common else 0.0,
+        ratio(common, full_b) if common else 0.0,
+        ratio(full_a, full_b)
+    )
+
+
+def cache_clear():
+    ratio.cache_clear()
+    token_set_ratio.cache_clear()
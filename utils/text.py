@@ -1,6 +1,7 @@
 import re
 import unicodedata
-from difflib import SequenceMatcher
+
+from utils.similarity import ratio
 
 def normalize_title(title: str) -> str:
     return "".join(
@@ -22,4 +23,4 @@ def extract_year(title: str):
     return m.group() if m else None
 
 def similarity(a: str, b: str) -> float:
-    return SequenceMatcher(None, a, b).ratio()
+    return ratio(a, b)